@@ -0,0 +1,141 @@
+"""Headless benchmark for the tea pour fluid simulation
+
+Runs FluidSimulationScene without a window (SDL dummy video driver) for a
+number of fixed steps at each combination of particle count, cell size and
+kernel backend, and reports mean per-phase timings: particles, splat,
+pressure, gather, advect, diffuse, leaves and render.
+
+Run with: uv run fluid_benchmark.py --particles 800 5000 --cell-size 6 4 --json bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import numpy as np
+import pygame
+
+from game.fluid.kernels import available_backends
+from game.scenes import fluid_simulation_scene as fluid
+
+
+PHASES = ("particles", "splat", "pressure", "gather", "advect", "diffuse", "leaves", "render")
+
+
+def prefill_particles(sim, count, seed):
+    """Scatter particles through the cup so the run starts at full load"""
+    missing = count - len(sim.particles)
+    if missing <= 0:
+        return
+    rng = np.random.default_rng(seed)
+    inner = sim.cup_radius - fluid.CUP_WALL - fluid.PARTICLE_RADIUS
+    r = np.sqrt(rng.random(missing)) * inner
+    a = rng.random(missing) * 2 * np.pi
+    sim.particles.add(
+        sim.cup_cx + r * np.cos(a),
+        sim.cup_cy + r * np.sin(a),
+        0.0,
+        rng.uniform(20.0, 40.0, missing),
+        fluid.PARTICLE_RADIUS,
+        0.0,
+    )
+
+
+def run_case(screen, particles, cell_size, backend, steps, warmup, seed, prefill):
+    scene = fluid.FluidSimulationScene(
+        screen, cell_size=cell_size, seed=seed, max_particles=particles, kernel_backend=backend
+    )
+    sim = scene.sim
+    if prefill:
+        prefill_particles(sim, particles, seed)
+
+    # Warm-up covers JIT compilation and the parallel auto-tuner
+    for _ in range(warmup):
+        scene.update(fluid.SIM_DT)
+        scene.draw()
+
+    sim.timer.enabled = True
+    sim.timer.reset()
+    started = time.perf_counter()
+    for _ in range(steps):
+        scene.update(fluid.SIM_DT)
+        scene.draw()
+    elapsed = time.perf_counter() - started
+
+    report = sim.timer.report()
+    return {
+        "particles": particles,
+        "live_particles": len(sim.particles),
+        "leaves": len(sim.leaves),
+        "cell_size": cell_size,
+        "grid": [sim.grid_w, sim.grid_h],
+        "backend": sim.kernels.name,
+        "steps": steps,
+        "frame_ms": elapsed * 1000.0 / steps,
+        "phases_ms": {phase: report.get(phase, {}).get("mean_ms", 0.0) for phase in PHASES},
+    }
+
+
+def print_result(result):
+    phases = "  ".join(f"{phase} {ms:6.2f}" for phase, ms in result["phases_ms"].items())
+    print(
+        f"{result['backend']:>6}  cell {result['cell_size']}  "
+        f"particles {result['live_particles']:>6}  frame {result['frame_ms']:7.2f} ms  | {phases}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=300, help="timed steps per case")
+    parser.add_argument("--warmup", type=int, default=30, help="untimed steps before measuring")
+    parser.add_argument("--particles", type=int, nargs="+", default=[fluid.MAX_PARTICLES])
+    parser.add_argument("--cell-size", type=int, nargs="+", default=[fluid.CELL_SIZE])
+    parser.add_argument("--backend", nargs="+", default=["auto"],
+                        help=f"kernel backends ({', '.join(available_backends())} or auto)")
+    parser.add_argument("--no-prefill", action="store_true",
+                        help="start empty and let the pour fill the cup")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="write results to this file ('-' for stdout)")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode((fluid.WINDOW_WIDTH, fluid.WINDOW_HEIGHT))
+
+    results = []
+    for backend in args.backend:
+        for cell_size in args.cell_size:
+            for particles in args.particles:
+                result = run_case(
+                    screen, particles, cell_size, backend,
+                    args.steps, args.warmup, args.seed, not args.no_prefill,
+                )
+                print_result(result)
+                results.append(result)
+    pygame.quit()
+
+    if args.json:
+        payload = {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+            "results": results,
+        }
+        text = json.dumps(payload, indent=2)
+        if args.json == "-":
+            print(text)
+        else:
+            with open(args.json, "w", encoding="utf-8") as f:
+                f.write(text + "\n")
+            print(f"Wrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
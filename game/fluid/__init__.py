@@ -0,0 +1,5 @@
+"""Array-based building blocks for the fluid simulation"""
+from .particles import ParticleArrays
+from .kernels import available_backends, get_kernels
+
+__all__ = ['ParticleArrays', 'available_backends', 'get_kernels']
@@ -0,0 +1,122 @@
+"""Adaptive quality for a fluid simulation sharing the CPU with other work
+
+The loading screen runs the simulation while sprite loader threads compete
+for the same cores (and the GIL). The governor watches how long each frame's
+simulation and drawing take, and whether the loader is still making
+progress, and moves between preset quality levels to stay within budget.
+"""
+from collections import namedtuple
+
+
+# Particle cap, grid cell size in pixels and fixed steps per second
+QualityLevel = namedtuple("QualityLevel", ["max_particles", "cell_size", "sim_rate"])
+
+# Best first; the first level matches the simulation defaults
+QUALITY_LEVELS = (
+    QualityLevel(800, 6, 60),
+    QualityLevel(600, 6, 60),
+    QualityLevel(450, 8, 45),
+    QualityLevel(300, 8, 30),
+    QualityLevel(150, 12, 30),
+)
+
+
+class QualityGovernor:
+    """Picks a quality level from measured frame cost and loader progress
+
+    While loading, a frame may spend only `loading_share` of the target
+    frame time on its own work so the loader keeps the rest; afterwards the
+    whole frame is available. The level drops after `patience` consecutive
+    frames over budget, or whenever loading makes no progress for
+    `stall_time` seconds, and rises after `patience * 4` frames below
+    `headroom` of the budget. A rise that turns out to be over budget
+    doubles the wait before the next one, so the governor does not keep
+    bouncing between two levels. Counters restart after every change so
+    the new level is measured on its own.
+    """
+
+    def __init__(self, levels=QUALITY_LEVELS, target_fps: int = 60, loading_share: float = 0.4,
+                 patience: int = 10, headroom: float = 0.6, stall_time: float = 0.5,
+                 smoothing: float = 0.2):
+        self.levels = tuple(levels)
+        self.target_fps = target_fps
+        self.loading_share = loading_share
+        self.patience = patience
+        self.headroom = headroom
+        self.stall_time = stall_time
+        self.smoothing = smoothing
+        self.level = 0
+        self.loading = True
+        self.cost_ms = None
+        self._over = 0
+        self._under = 0
+        self._progress = 0
+        self._stalled = 0.0
+        self._backoff = 1
+        self._raised = False
+
+    @property
+    def quality(self) -> QualityLevel:
+        return self.levels[self.level]
+
+    @property
+    def budget_ms(self) -> float:
+        """Time a frame may spend on simulation and drawing"""
+        share = self.loading_share if self.loading else 1.0
+        return 1000.0 / self.target_fps * share
+
+    def finish_loading(self) -> None:
+        if self.loading:
+            self.loading = False
+            self._backoff = 1
+
+    def update(self, work_ms: float, frame_ms: float, progress: int) -> bool:
+        """Record one frame and return True if the quality level changed
+
+        Args:
+            work_ms: Time spent simulating and drawing this frame
+            frame_ms: Wall time since the previous frame
+            progress: Monotonic count of completed loading work
+        """
+        if self.cost_ms is None:
+            self.cost_ms = work_ms
+        else:
+            self.cost_ms += (work_ms - self.cost_ms) * self.smoothing
+
+        if progress != self._progress or not self.loading:
+            self._progress = progress
+            self._stalled = 0.0
+        else:
+            self._stalled += frame_ms / 1000.0
+            if self._stalled >= self.stall_time:
+                return self._change(1)
+
+        budget = self.budget_ms
+        if self.cost_ms > budget:
+            self._over += 1
+            self._under = 0
+            if self._over >= self.patience:
+                if self._raised:
+                    self._backoff = min(self._backoff * 2, 64)
+                return self._change(1)
+        elif self.cost_ms < budget * self.headroom:
+            self._under += 1
+            self._over = 0
+            if self._under >= self.patience * 4 * self._backoff:
+                return self._change(-1)
+        else:
+            self._over = 0
+            self._under = 0
+        return False
+
+    def _change(self, direction: int) -> bool:
+        level = min(len(self.levels) - 1, max(0, self.level + direction))
+        self._over = 0
+        self._under = 0
+        self._stalled = 0.0
+        if level == self.level:
+            return False
+        self._raised = direction < 0
+        self.level = level
+        self.cost_ms = None
+        return True
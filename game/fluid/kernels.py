@@ -0,0 +1,304 @@
+"""Interchangeable implementations of the fluid simulation's hot loops
+
+Backends:
+    python  Plain loops over dict buckets; the reference the others are
+            checked against (see test_fluid_kernels.py)
+    numpy   Vectorized pair search and bincount accumulation
+    numba   JIT-compiled loops, available when numba is installed
+
+Every backend resolves all contacts against the state at the start of the
+pass and sums the corrections, so they agree up to float rounding. Points
+are passed together with a SpatialHash already built over their positions.
+
+Range kernels take (start, stop) first so a TileExecutor can split them
+into tiles; only the numba kernels release the GIL, so only they run
+truly in parallel.
+"""
+import math
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .spatial_hash import SpatialHash
+
+try:
+    import numba
+except ImportError:  # numba is optional
+    numba = None
+
+
+class PythonKernels:
+    """Reference implementation in pure Python"""
+
+    name = "python"
+
+    def resolve_contacts(self, x, y, vx, vy, radius, grid: SpatialHash, restitution,
+                         tiles=None):
+        """Separate overlapping discs and exchange their normal velocity
+
+        Arrays are updated in place. The reference only takes the cell size
+        from `grid` and buckets the discs itself; `tiles` is accepted for
+        interface compatibility and ignored.
+
+        Returns:
+            Number of contacts per disc
+        """
+        n = len(x)
+        cell_size = grid.cell_size
+        px, py, pvx, pvy, pr = (a.tolist() for a in (x, y, vx, vy, radius))
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for idx in range(n):
+            key = (math.floor(px[idx] / cell_size), math.floor(py[idx] / cell_size))
+            buckets.setdefault(key, []).append(idx)
+
+        dx_acc = [0.0] * n
+        dy_acc = [0.0] * n
+        dvx_acc = [0.0] * n
+        dvy_acc = [0.0] * n
+        contacts = [0] * n
+        for idx in range(n):
+            cx = math.floor(px[idx] / cell_size)
+            cy = math.floor(py[idx] / cell_size)
+            for oy in (-1, 0, 1):
+                for ox in (-1, 0, 1):
+                    for j in buckets.get((cx + ox, cy + oy), ()):
+                        if j <= idx:
+                            continue
+                        dx = px[j] - px[idx]
+                        dy = py[j] - py[idx]
+                        dist2 = dx * dx + dy * dy
+                        min_dist = pr[idx] + pr[j]
+                        if dist2 <= 0.0001 or dist2 >= min_dist * min_dist:
+                            continue
+                        dist = math.sqrt(dist2)
+                        nx = dx / dist
+                        ny = dy / dist
+                        push = (min_dist - dist) * 0.5
+                        dx_acc[idx] -= nx * push
+                        dy_acc[idx] -= ny * push
+                        dx_acc[j] += nx * push
+                        dy_acc[j] += ny * push
+
+                        vn = (pvx[j] - pvx[idx]) * nx + (pvy[j] - pvy[idx]) * ny
+                        if vn < 0:
+                            impulse = -(1.0 + restitution) * vn * 0.5
+                            dvx_acc[idx] -= impulse * nx
+                            dvy_acc[idx] -= impulse * ny
+                            dvx_acc[j] += impulse * nx
+                            dvy_acc[j] += impulse * ny
+                        contacts[idx] += 1
+                        contacts[j] += 1
+
+        x += np.asarray(dx_acc, dtype=x.dtype)
+        y += np.asarray(dy_acc, dtype=y.dtype)
+        vx += np.asarray(dvx_acc, dtype=vx.dtype)
+        vy += np.asarray(dvy_acc, dtype=vy.dtype)
+        return np.asarray(contacts, dtype=np.int64)
+
+
+class NumpyKernels:
+    """Vectorized implementation using a sorted cell index"""
+
+    name = "numpy"
+
+    def resolve_contacts(self, x, y, vx, vy, radius, grid: SpatialHash, restitution,
+                         tiles=None):
+        """Separate overlapping discs and exchange their normal velocity
+
+        See PythonKernels.resolve_contacts. Runs as one batch; `tiles` is
+        ignored.
+        """
+        n = len(x)
+        contacts = np.zeros(n, dtype=np.int64)
+        i, j = grid.candidate_pairs()
+        if i.size == 0:
+            return contacts
+
+        dx = x[j] - x[i]
+        dy = y[j] - y[i]
+        dist2 = dx * dx + dy * dy
+        min_dist = radius[i] + radius[j]
+        hit = (dist2 > 0.0001) & (dist2 < min_dist * min_dist)
+        if not hit.any():
+            return contacts
+        i = i[hit]
+        j = j[hit]
+        dist = np.sqrt(dist2[hit])
+        nx = dx[hit] / dist
+        ny = dy[hit] / dist
+        push = (min_dist[hit] - dist) * 0.5
+
+        vn = (vx[j] - vx[i]) * nx + (vy[j] - vy[i]) * ny
+        impulse = np.where(vn < 0.0, -(1.0 + restitution) * vn * 0.5, 0.0)
+
+        x += np.bincount(j, push * nx, n) - np.bincount(i, push * nx, n)
+        y += np.bincount(j, push * ny, n) - np.bincount(i, push * ny, n)
+        dvx = np.bincount(j, impulse * nx, n) - np.bincount(i, impulse * nx, n)
+        dvy = np.bincount(j, impulse * ny, n) - np.bincount(i, impulse * ny, n)
+        vx += dvx
+        vy += dvy
+        return np.bincount(i, minlength=n) + np.bincount(j, minlength=n)
+
+
+def _jit(func):
+    # nogil lets tiles of the same kernel run on several threads at once
+    try:
+        return numba.njit(cache=True, nogil=True)(func)
+    except Exception:  # e.g. no writable cache location in a frozen build
+        return numba.njit(nogil=True)(func)
+
+
+if numba is not None:
+
+    @_jit
+    def _resolve_contacts_jit(x, y, vx, vy, radius, cells, order, cell_start, cols,
+                              restitution):
+        n = x.shape[0]
+        contacts = np.zeros(n, dtype=np.int64)
+        if n < 2:
+            return contacts
+
+        dx_acc = np.zeros(n)
+        dy_acc = np.zeros(n)
+        dvx_acc = np.zeros(n)
+        dvy_acc = np.zeros(n)
+        for i in range(n):
+            for oy in range(-1, 2):
+                for ox in range(-1, 2):
+                    # The hash's border cells keep neighbour keys in range
+                    key = cells[i] + oy * cols + ox
+                    for k in range(cell_start[key], cell_start[key + 1]):
+                        j = order[k]
+                        if j <= i:
+                            continue
+                        dx = x[j] - x[i]
+                        dy = y[j] - y[i]
+                        dist2 = dx * dx + dy * dy
+                        min_dist = radius[i] + radius[j]
+                        if dist2 <= 0.0001 or dist2 >= min_dist * min_dist:
+                            continue
+                        dist = math.sqrt(dist2)
+                        nx = dx / dist
+                        ny = dy / dist
+                        push = (min_dist - dist) * 0.5
+                        dx_acc[i] -= nx * push
+                        dy_acc[i] -= ny * push
+                        dx_acc[j] += nx * push
+                        dy_acc[j] += ny * push
+
+                        vn = (vx[j] - vx[i]) * nx + (vy[j] - vy[i]) * ny
+                        if vn < 0.0:
+                            impulse = -(1.0 + restitution) * vn * 0.5
+                            dvx_acc[i] -= impulse * nx
+                            dvy_acc[i] -= impulse * ny
+                            dvx_acc[j] += impulse * nx
+                            dvy_acc[j] += impulse * ny
+                        contacts[i] += 1
+                        contacts[j] += 1
+
+        for i in range(n):
+            x[i] += dx_acc[i]
+            y[i] += dy_acc[i]
+            vx[i] += dvx_acc[i]
+            vy[i] += dvy_acc[i]
+        return contacts
+
+    @_jit
+    def _gather_contacts_jit(start, stop, x, y, vx, vy, radius, cells, order, cell_start, cols,
+                             restitution, dx_acc, dy_acc, dvx_acc, dvy_acc, contacts):
+        # Each point sums only its own corrections, visiting every pair from
+        # both sides, so disjoint ranges of `order` can run concurrently
+        for k in range(start, stop):
+            i = order[k]
+            for oy in range(-1, 2):
+                for ox in range(-1, 2):
+                    key = cells[i] + oy * cols + ox
+                    for m in range(cell_start[key], cell_start[key + 1]):
+                        j = order[m]
+                        if j == i:
+                            continue
+                        dx = x[j] - x[i]
+                        dy = y[j] - y[i]
+                        dist2 = dx * dx + dy * dy
+                        min_dist = radius[i] + radius[j]
+                        if dist2 <= 0.0001 or dist2 >= min_dist * min_dist:
+                            continue
+                        dist = math.sqrt(dist2)
+                        nx = dx / dist
+                        ny = dy / dist
+                        push = (min_dist - dist) * 0.5
+                        dx_acc[i] -= nx * push
+                        dy_acc[i] -= ny * push
+                        vn = (vx[j] - vx[i]) * nx + (vy[j] - vy[i]) * ny
+                        if vn < 0.0:
+                            impulse = -(1.0 + restitution) * vn * 0.5
+                            dvx_acc[i] -= impulse * nx
+                            dvy_acc[i] -= impulse * ny
+                        contacts[i] += 1
+
+
+class NumbaKernels:
+    """JIT-compiled implementation; requires numba"""
+
+    name = "numba"
+
+    def resolve_contacts(self, x, y, vx, vy, radius, grid: SpatialHash, restitution,
+                         tiles=None):
+        """Separate overlapping discs and exchange their normal velocity
+
+        See PythonKernels.resolve_contacts. With a TileExecutor, points are
+        split into tiles of cell-sorted order (horizontal bands of the cup)
+        that may run on several threads.
+        """
+        n = len(x)
+        cells = grid.cells[:n]
+        order = grid.order[:n]
+        if tiles is None:
+            return _resolve_contacts_jit(
+                x, y, vx, vy, radius, cells, order, grid.cell_start, grid.cols,
+                float(restitution),
+            )
+
+        dx = np.zeros(n)
+        dy = np.zeros(n)
+        dvx = np.zeros(n)
+        dvy = np.zeros(n)
+        contacts = np.zeros(n, dtype=np.int64)
+        tiles.run(
+            "contacts", _gather_contacts_jit, n,
+            x, y, vx, vy, radius, cells, order, grid.cell_start, grid.cols, float(restitution),
+            dx, dy, dvx, dvy, contacts,
+        )
+        x += dx
+        y += dy
+        vx += dvx
+        vy += dvy
+        return contacts
+
+
+BACKENDS = {
+    "python": PythonKernels,
+    "numpy": NumpyKernels,
+    "numba": NumbaKernels,
+}
+
+
+def available_backends() -> List[str]:
+    """Names of the backends usable in this environment"""
+    return [name for name in BACKENDS if name != "numba" or numba is not None]
+
+
+def get_kernels(name: str = "auto"):
+    """Create a kernel backend by name
+
+    "auto" picks numba when it is installed and numpy otherwise. Asking for
+    numba without it installed falls back to numpy with a warning.
+    """
+    if name == "auto":
+        name = "numba" if numba is not None else "numpy"
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown kernel backend '{name}', expected one of {list(BACKENDS)}")
+    if name == "numba" and numba is None:
+        print("⚠️  numba is not installed, using the numpy fluid kernels")
+        name = "numpy"
+    return BACKENDS[name]()
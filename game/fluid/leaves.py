@@ -0,0 +1,247 @@
+"""Tea leaves as rigid segments stored as a struct of NumPy arrays
+
+A leaf is a thin rod: a centre, an angle and a length, with a linear and
+an angular velocity (both per step). For contacts it is a capsule of a
+given thickness, so two leaves touch where their segments come within one
+thickness of each other and a leaf touches the cup wall when either end
+does. Every pass handles all leaves with a few array operations.
+"""
+from typing import Tuple
+
+import numpy as np
+
+from game.fluid.spatial_hash import SpatialHash
+
+
+def _field(name: str) -> property:
+    return property(lambda self: self._data[name][:self.count])
+
+
+class LeafArrays:
+    """Growable struct-of-arrays leaf store
+
+    Fields are exposed as views of the live leaves (`x`, `y`, `vx`, `vy`,
+    `angle`, `spin`, `length`, `strength`) and may be updated in place.
+    """
+
+    FIELDS = ("x", "y", "vx", "vy", "angle", "spin", "length", "strength")
+
+    x = _field("x")
+    y = _field("y")
+    vx = _field("vx")
+    vy = _field("vy")
+    angle = _field("angle")
+    spin = _field("spin")
+    length = _field("length")
+    strength = _field("strength")
+
+    def __init__(self, capacity: int = 64):
+        self.count = 0
+        self._data = {name: np.zeros(capacity, dtype=np.float32) for name in self.FIELDS}
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data["x"])
+
+    def add(self, x, y, angle, length, strength=1.0) -> None:
+        """Append resting leaves; each argument is a scalar or an array of equal length"""
+        n = len(np.atleast_1d(x))
+        if n == 0:
+            return
+        end = self.count + n
+        if end > self.capacity:
+            self._grow(end)
+        for name in self.FIELDS:
+            self._data[name][self.count:end] = 0.0
+        for name, values in (("x", x), ("y", y), ("angle", angle), ("length", length),
+                             ("strength", strength)):
+            self._data[name][self.count:end] = values
+        self.count = end
+
+    def half_extent(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Vector from each leaf's centre to its second end"""
+        half = self.length * 0.5
+        return np.cos(self.angle) * half, np.sin(self.angle) * half
+
+    def endpoints(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(ax, ay, bx, by) of every leaf's two ends"""
+        hx, hy = self.half_extent()
+        return self.x - hx, self.y - hy, self.x + hx, self.y + hy
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(needed, self.capacity * 2)
+        for name, old in self._data.items():
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            self._data[name] = new
+
+
+def _cross(ax, ay, bx, by):
+    return ax * by - ay * bx
+
+
+def _inv_inertia(length: np.ndarray) -> np.ndarray:
+    # A uniform rod of unit mass about its centre
+    return 12.0 / np.maximum(length * length, 1e-6)
+
+
+def closest_points(px, py, dx, dy, qx, qy, ex, ey) -> Tuple[np.ndarray, np.ndarray]:
+    """Closest points between segments p + s*d and q + t*e, s and t in [0, 1]
+
+    Returns the (s, t) parameters; segments must have nonzero length.
+    """
+    rx = px - qx
+    ry = py - qy
+    a = dx * dx + dy * dy
+    e = ex * ex + ey * ey
+    b = dx * ex + dy * ey
+    c = dx * rx + dy * ry
+    f = ex * rx + ey * ry
+    denom = a * e - b * b
+    # Parallel segments: any s works, start from 0
+    safe = np.where(denom > 1e-6 * a * e, denom, 1.0)
+    s = np.where(denom > 1e-6 * a * e, np.clip((b * f - c * e) / safe, 0.0, 1.0), 0.0)
+    t = (b * s + f) / e
+    s = np.where(t < 0.0, np.clip(-c / a, 0.0, 1.0), np.where(t > 1.0, np.clip((b - c) / a, 0.0, 1.0), s))
+    t = np.clip(t, 0.0, 1.0)
+    return s, t
+
+
+def resolve_segment_contacts(leaves: LeafArrays, grid: SpatialHash, thickness: float,
+                             restitution: float, friction: float = 1.0) -> np.ndarray:
+    """Separate overlapping leaves and exchange impulses at their contacts
+
+    `grid` must be built over the leaf centres with cells at least as large
+    as the longest leaf plus `thickness`, so every touching pair is a
+    candidate. Like the particle kernels, all contacts are measured against
+    the state at the start of the pass and their corrections summed. Each
+    leaf's velocity and spin are scaled by `friction` per contact.
+
+    Returns:
+        Number of contacts per leaf
+    """
+    n = len(leaves)
+    contacts = np.zeros(n, dtype=np.int64)
+    if n < 2:
+        return contacts
+    i, j = grid.candidate_pairs()
+    if i.size == 0:
+        return contacts
+
+    x, y, vx, vy, spin = leaves.x, leaves.y, leaves.vx, leaves.vy, leaves.spin
+    # Bounding circles first; most candidates are too far apart to touch
+    reach = (leaves.length[i] + leaves.length[j]) * 0.5 + thickness
+    near = (x[j] - x[i]) ** 2 + (y[j] - y[i]) ** 2 < reach * reach
+    i, j = i[near], j[near]
+    if i.size == 0:
+        return contacts
+
+    hx, hy = leaves.half_extent()
+    s, t = closest_points(
+        x[i] - hx[i], y[i] - hy[i], hx[i] * 2, hy[i] * 2,
+        x[j] - hx[j], y[j] - hy[j], hx[j] * 2, hy[j] * 2,
+    )
+    # Contact points relative to each leaf's centre
+    rix = (2 * s - 1) * hx[i]
+    riy = (2 * s - 1) * hy[i]
+    rjx = (2 * t - 1) * hx[j]
+    rjy = (2 * t - 1) * hy[j]
+    dx = x[j] + rjx - x[i] - rix
+    dy = y[j] + rjy - y[i] - riy
+    dist2 = dx * dx + dy * dy
+    hit = dist2 < thickness * thickness
+    if not hit.any():
+        return contacts
+    i, j = i[hit], j[hit]
+    rix, riy, rjx, rjy = rix[hit], riy[hit], rjx[hit], rjy[hit]
+    dx, dy = dx[hit], dy[hit]
+    dist = np.sqrt(dist2[hit])
+
+    # Crossing segments have no separating direction; push across leaf i,
+    # towards the side leaf j's centre is on
+    crossed = dist < 1e-4
+    px, py = -hy[i], hx[i]
+    side = np.where(px * (x[j] - x[i]) + py * (y[j] - y[i]) < 0.0, -1.0, 1.0)
+    plen = np.maximum(np.hypot(px, py), 1e-6)
+    safe = np.where(crossed, 1.0, dist)
+    nx = np.where(crossed, px * side / plen, dx / safe)
+    ny = np.where(crossed, py * side / plen, dy / safe)
+    push = (thickness - dist) * 0.5
+
+    inv_i = _inv_inertia(leaves.length[i])
+    inv_j = _inv_inertia(leaves.length[j])
+    arm_i = _cross(rix, riy, nx, ny)
+    arm_j = _cross(rjx, rjy, nx, ny)
+    # Normal velocity of the contact point on j relative to the one on i
+    vn = (
+        (vx[j] - spin[j] * rjy - vx[i] + spin[i] * riy) * nx
+        + (vy[j] + spin[j] * rjx - vy[i] - spin[i] * rix) * ny
+    )
+    impulse = np.where(
+        vn < 0.0,
+        -(1.0 + restitution) * vn / (2.0 + arm_i * arm_i * inv_i + arm_j * arm_j * inv_j),
+        0.0,
+    )
+
+    x += np.bincount(j, push * nx, n) - np.bincount(i, push * nx, n)
+    y += np.bincount(j, push * ny, n) - np.bincount(i, push * ny, n)
+    dvx = np.bincount(j, impulse * nx, n) - np.bincount(i, impulse * nx, n)
+    dvy = np.bincount(j, impulse * ny, n) - np.bincount(i, impulse * ny, n)
+    dspin = np.bincount(j, impulse * arm_j * inv_j, n) - np.bincount(i, impulse * arm_i * inv_i, n)
+    contacts = np.bincount(i, minlength=n) + np.bincount(j, minlength=n)
+    damp = np.power(friction, contacts) if friction != 1.0 else 1.0
+    vx[:] = (vx + dvx) * damp
+    vy[:] = (vy + dvy) * damp
+    spin[:] = (spin + dspin) * damp
+    return contacts
+
+
+def confine_to_circle(leaves: LeafArrays, cx: float, cy: float, radius: float,
+                      friction: float = 1.0) -> np.ndarray:
+    """Keep both ends of every leaf within `radius` of (cx, cy)
+
+    An end past the wall moves the leaf back inside, and the end's outward
+    velocity is removed with an impulse that also turns the leaf. Leaves
+    resting on the lower part of the wall (the cup's floor) have their
+    velocity and spin scaled by `friction`.
+
+    Returns:
+        Mask of leaves that touched the wall
+    """
+    x, y, vx, vy, spin = leaves.x, leaves.y, leaves.vx, leaves.vy, leaves.spin
+    hx, hy = leaves.half_extent()
+    inv_inertia = _inv_inertia(leaves.length)
+    touching = np.zeros(len(leaves), dtype=bool)
+    floor = np.zeros(len(leaves), dtype=bool)
+    for end in (-1.0, 1.0):
+        rx = hx * end
+        ry = hy * end
+        ox = x + rx - cx
+        oy = y + ry - cy
+        dist = np.hypot(ox, oy)
+        out = np.nonzero(dist > radius)[0]
+        if not out.size:
+            continue
+        nx = ox[out] / dist[out]
+        ny = oy[out] / dist[out]
+        over = dist[out] - radius
+        x[out] -= nx * over
+        y[out] -= ny * over
+
+        arm = _cross(rx[out], ry[out], nx, ny)
+        vn = (vx[out] - spin[out] * ry[out]) * nx + (vy[out] + spin[out] * rx[out]) * ny
+        impulse = np.maximum(vn, 0.0) / (1.0 + arm * arm * inv_inertia[out])
+        vx[out] -= impulse * nx
+        vy[out] -= impulse * ny
+        spin[out] -= impulse * arm * inv_inertia[out]
+        touching[out] = True
+        floor[out[ny > 0.5]] = True
+
+    if friction != 1.0 and floor.any():
+        vx[floor] *= friction
+        vy[floor] *= friction
+        spin[floor] *= friction
+    return touching
@@ -0,0 +1,90 @@
+"""Tiled execution of simulation work across worker threads
+
+Work is split into contiguous tiles (grid rows, or particles sorted by cell)
+and run on a thread pool. This only pays off when the tile function
+releases the GIL, as the numba kernels do, and when tiles are big enough to
+outweigh dispatch overhead, so an auto-tuner times both modes for each kind
+of work and size and keeps the faster one.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+
+PARALLEL_MODES = ("auto", "serial", "parallel")
+
+
+class TileExecutor:
+    """Runs `work(start, stop, *args)` over [0, size) serially or in tiles
+
+    Args:
+        workers: Worker threads; defaults to one less than the CPU count
+        mode: "auto" to pick per workload by timing, or force "serial" or
+            "parallel"
+        trials: Timed runs of each mode before "auto" settles
+    """
+
+    def __init__(self, workers: int = None, mode: str = "auto", trials: int = 5):
+        if mode not in PARALLEL_MODES:
+            raise ValueError(f"Unknown parallel mode '{mode}', expected one of {PARALLEL_MODES}")
+        self.workers = workers if workers is not None else max(1, (os.cpu_count() or 2) - 1)
+        self.mode = mode
+        self.trials = trials
+        self._pool = ThreadPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+        self._chosen: Dict[Tuple[str, int], str] = {}
+        self._timings: Dict[Tuple[str, int], Dict[str, List[float]]] = {}
+
+    def run(self, name: str, work: Callable, size: int, *args) -> None:
+        """Run `work` over [0, size), choosing serial or tiled execution"""
+        if size <= 0:
+            return
+        # Sizes within a factor of two share a decision
+        key = (name, size.bit_length())
+        mode = self._pick(key)
+        tuning = self._pool is not None and self.mode == "auto" and key not in self._chosen
+        started = time.perf_counter()
+
+        if mode == "serial":
+            work(0, size, *args)
+        else:
+            tiles = self.workers * 2
+            step = max(1, -(-size // tiles))
+            futures = [
+                self._pool.submit(work, start, min(size, start + step), *args)
+                for start in range(0, size, step)
+            ]
+            for future in futures:
+                future.result()
+
+        if tuning:
+            self._record(key, mode, time.perf_counter() - started)
+
+    def _pick(self, key: Tuple[str, int]) -> str:
+        if self._pool is None:
+            return "serial"
+        if self.mode != "auto":
+            return self.mode
+        chosen = self._chosen.get(key)
+        if chosen is not None:
+            return chosen
+        # Alternate modes while trialling
+        timings = self._timings.get(key, {"serial": [], "parallel": []})
+        return "serial" if len(timings["serial"]) <= len(timings["parallel"]) else "parallel"
+
+    def _record(self, key: Tuple[str, int], mode: str, elapsed: float) -> None:
+        timings = self._timings.setdefault(key, {"serial": [], "parallel": []})
+        timings[mode].append(elapsed)
+        if all(len(samples) >= self.trials for samples in timings.values()):
+            best = {m: sorted(samples)[len(samples) // 2] for m, samples in timings.items()}
+            self._chosen[key] = min(best, key=best.get)
+            del self._timings[key]
+
+    def decisions(self) -> Dict[Tuple[str, int], str]:
+        """Modes the auto-tuner has settled on, keyed by (work name, size class)"""
+        return dict(self._chosen)
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+
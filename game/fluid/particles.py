@@ -0,0 +1,119 @@
+"""Water particles stored as a struct of NumPy arrays
+
+Every per-particle quantity lives in its own contiguous array so that
+integration and collision run as a handful of array
+operations instead of a Python loop per particle.
+"""
+import numpy as np
+
+
+class ParticleArrays:
+    """Growable struct-of-arrays particle store
+
+    Fields are exposed as views of the live particles (`x`, `y`, `vx`, `vy`,
+    `radius`, `dye`) and may be updated in place.
+    """
+
+    FIELDS = ("x", "y", "vx", "vy", "radius", "dye")
+
+    def __init__(self, capacity: int = 1024):
+        self.count = 0
+        self._data = {name: np.zeros(capacity, dtype=np.float32) for name in self.FIELDS}
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data["x"])
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._data["x"][:self.count]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._data["y"][:self.count]
+
+    @property
+    def vx(self) -> np.ndarray:
+        return self._data["vx"][:self.count]
+
+    @property
+    def vy(self) -> np.ndarray:
+        return self._data["vy"][:self.count]
+
+    @property
+    def radius(self) -> np.ndarray:
+        return self._data["radius"][:self.count]
+
+    @property
+    def dye(self) -> np.ndarray:
+        return self._data["dye"][:self.count]
+
+    def add(self, x, y, vx, vy, radius, dye) -> None:
+        """Append particles; each argument is a scalar or an array of equal length"""
+        n = len(np.atleast_1d(x))
+        if n == 0:
+            return
+        needed = self.count + n
+        if needed > self.capacity:
+            self._grow(needed)
+        end = self.count + n
+        for name, values in zip(self.FIELDS, (x, y, vx, vy, radius, dye)):
+            self._data[name][self.count:end] = values
+        self.count = end
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def truncate(self, count: int) -> None:
+        """Keep only the first `count` particles"""
+        self.count = max(0, min(self.count, count))
+
+    def _grow(self, needed: int) -> None:
+        capacity = max(needed, self.capacity * 2)
+        for name, old in self._data.items():
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            self._data[name] = new
+
+
+def integrate(particles: ParticleArrays, dt: float, gravity: float, damp: float) -> None:
+    """Apply gravity and damping, then move particles by their velocity"""
+    vx = particles.vx
+    vy = particles.vy
+    vy += gravity * dt
+    vx *= damp
+    vy *= damp
+    particles.x[:] += vx * dt
+    particles.y[:] += vy * dt
+
+
+def collide_circle(particles: ParticleArrays, cx: float, cy: float, inner_radius: float,
+                   restitution: float) -> None:
+    """Keep particles inside a circle, reflecting their outward velocity"""
+    x = particles.x
+    y = particles.y
+    dx = x - cx
+    dy = y - cy
+    dist = np.hypot(dx, dy)
+    limit = np.maximum(0.0, inner_radius - particles.radius)
+    outside = np.nonzero(dist > limit)[0]
+    if outside.size == 0:
+        return
+
+    dist_o = dist[outside]
+    safe = np.where(dist_o > 0.0, dist_o, 1.0)
+    nx = np.where(dist_o > 0.0, dx[outside] / safe, 1.0)
+    ny = np.where(dist_o > 0.0, dy[outside] / safe, 0.0)
+    x[outside] = cx + nx * limit[outside]
+    y[outside] = cy + ny * limit[outside]
+
+    vx = particles.vx
+    vy = particles.vy
+    vn = vx[outside] * nx + vy[outside] * ny
+    bounce = np.where(vn > 0.0, (1.0 + restitution) * vn, 0.0)
+    vx[outside] -= bounce * nx
+    vy[outside] -= bounce * ny
+
@@ -0,0 +1,228 @@
+"""Pressure projection for the water's grid velocity field
+
+The grid stores one velocity per cell. Velocities are averaged onto the
+faces between cells, the divergence of that face field is made to match a
+target (zero, or outflow where water is packed above its rest density) by
+solving a Poisson equation for pressure, and the pressure gradient is taken
+back out of the cell velocities.
+
+Cells are fluid (solved for), air (pressure zero, the free surface) or solid
+(outside the cup: no flow through their faces). All quantities are in cell
+units, so the solve does not depend on the cell size.
+
+Solvers work on flat index sets of the fluid cells in a zero-padded
+pressure array, so each sweep only touches water:
+    rbgs       Red-black Gauss-Seidel with over-relaxation
+    multigrid  V-cycles of red-black smoothing over successively coarser
+               grids, which removes smooth error far faster
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+
+PRESSURE_SOLVERS = ("rbgs", "multigrid")
+
+
+class _Level:
+    """The fluid cells of one grid with their red and black update sets"""
+
+    def __init__(self, fluid: np.ndarray, solid: np.ndarray):
+        self.shape = fluid.shape
+        height, width = fluid.shape
+        self.stride = width + 2
+        self.size = (height + 2) * self.stride
+
+        padded_solid = np.ones((height + 2, width + 2), dtype=bool)
+        padded_solid[1:-1, 1:-1] = solid
+        padded_solid = padded_solid.ravel()
+
+        self.rows, self.cols = np.nonzero(fluid)
+        self.index = (self.rows + 1) * self.stride + self.cols + 1
+        # Solid neighbours drop out of the stencil (zero-gradient walls)
+        idx = self.index
+        open_sides = 4 - (
+            padded_solid[idx - 1].astype(np.int8)
+            + padded_solid[idx + 1]
+            + padded_solid[idx - self.stride]
+            + padded_solid[idx + self.stride]
+        )
+        self.diag = np.maximum(open_sides, 1).astype(np.float32)
+
+        red = ((self.rows + self.cols) & 1) == 0
+        self.sets = []
+        for members in (np.nonzero(red)[0], np.nonzero(~red)[0]):
+            self.sets.append((idx[members], 1.0 / self.diag[members], members))
+
+        # Filled in by the next coarser level
+        self.parent = None
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def neighbours(self, p: np.ndarray, idx: np.ndarray) -> np.ndarray:
+        stride = self.stride
+        return p[idx - 1] + p[idx + 1] + p[idx - stride] + p[idx + stride]
+
+    def smooth(self, p: np.ndarray, rhs: np.ndarray, sweeps: int, omega: float) -> None:
+        for _ in range(sweeps):
+            for idx, inv_diag, members in self.sets:
+                target = (self.neighbours(p, idx) - rhs[members]) * inv_diag
+                p[idx] += omega * (target - p[idx])
+
+    def residual(self, p: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+        idx = self.index
+        return rhs - (self.neighbours(p, idx) - self.diag * p[idx])
+
+    def coarsen(self, fluid: np.ndarray, solid: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Fluid and solid masks of the grid with cells twice as large
+
+        A coarse cell is solid if all four of its cells are, and fluid if it
+        holds water and no air, so the free surface never moves inward on
+        coarser grids. Fine fluid cells are linked to their coarse cell;
+        those under a surface block (`parent` -1) are left to the smoother.
+        """
+        height, width = self.shape
+        ch, cw = (height + 1) // 2, (width + 1) // 2
+        padded_fluid = np.zeros((ch * 2, cw * 2), dtype=bool)
+        padded_fluid[:height, :width] = fluid
+        padded_solid = np.ones((ch * 2, cw * 2), dtype=bool)
+        padded_solid[:height, :width] = solid
+        blocks_fluid = padded_fluid.reshape(ch, 2, cw, 2)
+        blocks_solid = padded_solid.reshape(ch, 2, cw, 2)
+        coarse_solid = blocks_solid.all(axis=(1, 3))
+        coarse_fluid = blocks_fluid.any(axis=(1, 3)) & (blocks_fluid | blocks_solid).all(axis=(1, 3))
+
+        position = np.full((ch, cw), -1, dtype=np.intp)
+        position[coarse_fluid] = np.arange(int(coarse_fluid.sum()))
+        self.parent = position[self.rows // 2, self.cols // 2]
+        self.coarsened = self.parent >= 0
+        return coarse_fluid, coarse_solid
+
+
+class PressureSolver:
+    """Solves for the pressure that removes the divergence of a region
+
+    Args:
+        method: "rbgs" or "multigrid"
+        iterations: Most sweeps (rbgs) or V-cycles (multigrid) per solve
+        tolerance: Stop once the largest residual falls below this fraction
+            of the largest right-hand side
+        omega: Over-relaxation factor of the rbgs sweeps
+    """
+
+    def __init__(self, method: str = "rbgs", iterations: int = 8, tolerance: float = 1e-2,
+                 omega: float = 1.8):
+        if method not in PRESSURE_SOLVERS:
+            raise ValueError(f"Unknown pressure solver '{method}', expected one of {PRESSURE_SOLVERS}")
+        self.method = method
+        self.iterations = iterations
+        self.tolerance = tolerance
+        self.omega = omega
+        # Iterations and relative residual of the latest solve
+        self.last_iterations = 0
+        self.last_residual = 0.0
+
+    def _levels(self, fluid: np.ndarray, solid: np.ndarray) -> List[_Level]:
+        levels = [_Level(fluid, solid)]
+        if self.method == "multigrid":
+            while len(levels[-1]) > 16 and min(levels[-1].shape) > 2:
+                fluid, solid = levels[-1].coarsen(fluid, solid)
+                levels.append(_Level(fluid, solid))
+        return levels
+
+    def _vcycle(self, levels: List[_Level], depth: int, p: np.ndarray, rhs: np.ndarray) -> None:
+        level = levels[depth]
+        if depth == len(levels) - 1:
+            level.smooth(p, rhs, 8, 1.0)
+            return
+        level.smooth(p, rhs, 2, 1.0)
+        coarse = levels[depth + 1]
+        # A correction constant over each 2x2 block sees twice the flux of
+        # a coarse cell's stencil, so the block's summed residual is halved
+        linked = level.coarsened
+        parent = level.parent[linked]
+        coarse_rhs = np.bincount(parent, level.residual(p, rhs)[linked], minlength=len(coarse)) * 0.5
+        coarse_p = np.zeros(coarse.size, dtype=p.dtype)
+        self._vcycle(levels, depth + 1, coarse_p, coarse_rhs.astype(p.dtype))
+        p[level.index[linked]] += coarse_p[coarse.index][parent]
+        level.smooth(p, rhs, 2, 1.0)
+
+    def solve(self, rhs: np.ndarray, fluid: np.ndarray, solid: np.ndarray,
+              pressure: np.ndarray) -> None:
+        """Solve in place for `pressure` over the fluid cells
+
+        `pressure` holds the starting guess (the previous step's result
+        warms the solve up) and receives the answer, zero outside fluid.
+        """
+        levels = self._levels(fluid, solid)
+        level = levels[0]
+        self.last_iterations = 0
+        self.last_residual = 0.0
+        if not len(level):
+            pressure[...] = 0.0
+            return
+
+        p = np.zeros(level.size, dtype=np.float32)
+        p[level.index] = pressure[level.rows, level.cols]
+        b = rhs[level.rows, level.cols].astype(np.float32)
+        scale = float(np.abs(b).max())
+        if scale > 0.0:
+            limit = self.tolerance * scale
+            for iteration in range(1, self.iterations + 1):
+                if self.method == "multigrid":
+                    self._vcycle(levels, 0, p, b)
+                else:
+                    level.smooth(p, b, 1, self.omega)
+                self.last_iterations = iteration
+                residual = float(np.abs(level.residual(p, b)).max())
+                self.last_residual = residual / scale
+                if residual <= limit:
+                    break
+        else:
+            p[:] = 0.0
+
+        pressure[...] = 0.0
+        pressure[level.rows, level.cols] = p[level.index]
+
+
+def face_divergence(u: np.ndarray, v: np.ndarray, fluid: np.ndarray, solid: np.ndarray) -> np.ndarray:
+    """Net outflow of each cell through its faces, in cell units
+
+    A face carries the mean velocity of the fluid cells on either side of
+    it (so a free-surface face takes the water's velocity), and nothing if
+    it touches a solid cell, only air, or the edge of the arrays.
+    """
+    div = np.zeros(u.shape, dtype=np.float32)
+    for field, axis in ((u, 1), (v, 0)):
+        first = (slice(None), slice(None, -1)) if axis else (slice(None, -1), slice(None))
+        second = (slice(None), slice(1, None)) if axis else (slice(1, None), slice(None))
+        wet = fluid[first].astype(np.float32) + fluid[second]
+        flow = field[first] * fluid[first] + field[second] * fluid[second]
+        face = np.where(~(solid[first] | solid[second]) & (wet > 0), flow / np.maximum(wet, 1.0), 0.0)
+        div[first] += face
+        div[second] -= face
+    return div
+
+
+def pressure_gradient(pressure: np.ndarray, fluid: np.ndarray, solid: np.ndarray
+                      ) -> Tuple[np.ndarray, np.ndarray]:
+    """Cell-centred pressure gradient over the fluid cells
+
+    Solid neighbours mirror the cell's own pressure; air neighbours and the
+    array edge are at zero.
+    """
+    padded = np.zeros((pressure.shape[0] + 2, pressure.shape[1] + 2), dtype=np.float32)
+    padded[1:-1, 1:-1] = pressure
+    centre = padded[1:-1, 1:-1]
+    walls = np.zeros(padded.shape, dtype=bool)
+    walls[1:-1, 1:-1] = solid
+
+    def side(rows: slice, cols: slice) -> np.ndarray:
+        return np.where(walls[rows, cols], centre, padded[rows, cols])
+
+    grad_x = (side(slice(1, -1), slice(2, None)) - side(slice(1, -1), slice(None, -2))) * 0.5
+    grad_y = (side(slice(2, None), slice(1, -1)) - side(slice(None, -2), slice(1, -1))) * 0.5
+    grad_x[~fluid] = 0.0
+    grad_y[~fluid] = 0.0
+    return grad_x, grad_y
@@ -0,0 +1,47 @@
+"""Lightweight per-phase timing for the fluid simulation"""
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Dict
+
+
+class PhaseTimer:
+    """Accumulates wall time spent in named phases
+
+    Disabled timers hand out a shared no-op context, so instrumented code
+    costs next to nothing outside benchmarks.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.totals: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+        self._noop = nullcontext()
+
+    def __call__(self, phase: str):
+        if not self.enabled:
+            return self._noop
+        return self._measure(phase)
+
+    @contextmanager
+    def _measure(self, phase: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.totals[phase] = self.totals.get(phase, 0.0) + time.perf_counter() - started
+            self.counts[phase] = self.counts.get(phase, 0) + 1
+
+    def reset(self) -> None:
+        self.totals.clear()
+        self.counts.clear()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Total and mean milliseconds per phase"""
+        return {
+            phase: {
+                "total_ms": total * 1000.0,
+                "mean_ms": total * 1000.0 / self.counts[phase],
+                "calls": self.counts[phase],
+            }
+            for phase, total in self.totals.items()
+        }
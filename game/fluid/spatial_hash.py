@@ -0,0 +1,159 @@
+"""Uniform grid spatial hash backed by flat arrays
+
+Points are bucketed by counting sort: per-cell counts are accumulated in
+place, prefix-summed into `cell_start`, and `order` lists point indices
+grouped by cell, so the points of cell `c` are
+`order[cell_start[c]:cell_start[c + 1]]`. All buffers are allocated once
+and reused by every rebuild; no per-cell Python objects are created.
+"""
+import math
+from typing import Tuple
+
+import numpy as np
+
+
+class SpatialHash:
+    """Buckets points into square cells covering a fixed pixel area
+
+    The grid has a one-cell border on every side so neighbour lookups never
+    need bounds checks; points outside the area are clamped to the edge
+    cells.
+    """
+
+    def __init__(self, width: float, height: float, cell_size: float, capacity: int = 1024):
+        self.cell_size = float(cell_size)
+        self.inv_cell = 1.0 / self.cell_size
+        self.cols = int(math.ceil(width / self.cell_size)) + 2
+        self.rows = int(math.ceil(height / self.cell_size)) + 2
+        self.count = 0
+
+        num_cells = self.cols * self.rows
+        self.cell_count = np.zeros(num_cells, dtype=np.intp)
+        self.cell_start = np.zeros(num_cells + 1, dtype=np.intp)
+        self.cells = np.zeros(capacity, dtype=np.intp)
+        self.order = np.zeros(capacity, dtype=np.intp)
+        self._cx = np.zeros(capacity, dtype=np.intp)
+        self._scratch = np.zeros(capacity, dtype=np.float32)
+        self._points_x = self._scratch[:0]
+        self._points_y = self._scratch[:0]
+
+    def _reserve(self, count: int) -> None:
+        if count <= len(self.cells):
+            return
+        capacity = max(count, len(self.cells) * 2)
+        self.cells = np.zeros(capacity, dtype=np.intp)
+        self.order = np.zeros(capacity, dtype=np.intp)
+        self._cx = np.zeros(capacity, dtype=np.intp)
+        self._scratch = np.zeros(capacity, dtype=np.float32)
+
+    def cell_coords(self, x, y) -> Tuple[np.ndarray, np.ndarray]:
+        """Padded cell column and row of positions"""
+        cx = np.clip(np.floor(np.asarray(x) * self.inv_cell), -1, self.cols - 2).astype(np.intp) + 1
+        cy = np.clip(np.floor(np.asarray(y) * self.inv_cell), -1, self.rows - 2).astype(np.intp) + 1
+        return cx, cy
+
+    def build(self, x: np.ndarray, y: np.ndarray) -> None:
+        """Rebuild the buckets for a new set of point positions
+
+        The position arrays are kept by reference for `query_radius`, which
+        therefore sees later in-place moves of the points.
+        """
+        n = len(x)
+        self._reserve(n)
+        self.count = n
+        self._points_x = x
+        self._points_y = y
+        cells = self.cells[:n]
+        cx = self._cx[:n]
+        scratch = self._scratch[:n]
+
+        np.multiply(x, self.inv_cell, out=scratch)
+        np.floor(scratch, out=scratch)
+        np.clip(scratch, -1, self.cols - 2, out=scratch)
+        cx[:] = scratch
+        np.multiply(y, self.inv_cell, out=scratch)
+        np.floor(scratch, out=scratch)
+        np.clip(scratch, -1, self.rows - 2, out=scratch)
+        cells[:] = scratch
+        cells += 1
+        cells *= self.cols
+        cells += cx
+        cells += 1
+
+        self.cell_count.fill(0)
+        np.add.at(self.cell_count, cells, 1)
+        self.cell_start[0] = 0
+        np.cumsum(self.cell_count, out=self.cell_start[1:])
+        self.order[:n] = np.argsort(cells, kind="stable")
+
+    def candidate_pairs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Index pairs (i, j) of points in the same or adjacent cells
+
+        Each point is matched against later points of its own cell and all
+        points of four of its eight neighbours, so every pair appears once.
+        Pairs closer than the cell size are guaranteed to be included.
+        """
+        n = self.count
+        order = self.order[:n]
+        sorted_cells = self.cells[order]
+        pairs_i = []
+        pairs_j = []
+
+        owners, positions = _expand_ranges(np.arange(1, n + 1), self.cell_start[sorted_cells + 1])
+        pairs_i.append(order[owners])
+        pairs_j.append(order[positions])
+        cols = self.cols
+        for offset in (1, cols - 1, cols, cols + 1):
+            neighbour = sorted_cells + offset
+            owners, positions = _expand_ranges(self.cell_start[neighbour], self.cell_start[neighbour + 1])
+            pairs_i.append(order[owners])
+            pairs_j.append(order[positions])
+        return np.concatenate(pairs_i), np.concatenate(pairs_j)
+
+    def query_radius(self, qx, qy, radius: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Find hashed points within `radius` of each query position
+
+        Returns:
+            (query index, point index) arrays of every match
+        """
+        qx = np.atleast_1d(np.asarray(qx, dtype=np.float32))
+        qy = np.atleast_1d(np.asarray(qy, dtype=np.float32))
+        if self.count == 0 or len(qx) == 0:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+
+        reach = int(math.ceil(radius * self.inv_cell))
+        cx, cy = self.cell_coords(qx, qy)
+        queries = np.arange(len(qx))
+        found_q = []
+        found_p = []
+        for oy in range(-reach, reach + 1):
+            row = cy + oy
+            for ox in range(-reach, reach + 1):
+                col = cx + ox
+                valid = (col >= 0) & (col < self.cols) & (row >= 0) & (row < self.rows)
+                cell = (row * self.cols + col)[valid]
+                owners, positions = _expand_ranges(self.cell_start[cell], self.cell_start[cell + 1])
+                found_q.append(queries[valid][owners])
+                found_p.append(self.order[positions])
+
+        q = np.concatenate(found_q)
+        p = np.concatenate(found_p)
+        dx = self._points_x[p] - qx[q]
+        dy = self._points_y[p] - qy[q]
+        near = dx * dx + dy * dy <= radius * radius
+        return q[near], p[near]
+
+
+def _expand_ranges(starts: np.ndarray, ends: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Expand per-owner [start, end) ranges into (owner, position) pairs"""
+    counts = ends - starts
+    np.maximum(counts, 0, out=counts)
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty
+    owners = np.repeat(np.arange(len(starts)), counts)
+    run_starts = np.cumsum(counts) - counts
+    positions = np.repeat(starts - run_starts, counts) + np.arange(total)
+    return owners, positions
@@ -0,0 +1,45 @@
+"""Cache of small pre-rendered shapes for batched drawing
+
+Instead of rasterizing every particle and leaf each frame, shapes are drawn
+once per quantized appearance into a colour-keyed surface and then blitted
+in a single `Surface.blits` call.
+"""
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+import pygame
+
+
+STAMP_COLORKEY = (255, 0, 255)
+
+
+class StampCache:
+    """Bounded least-recently-used map of appearance key -> stamp surface"""
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._stamps = OrderedDict()
+
+    def get(self, key: Hashable, draw: Callable[[pygame.Surface], None], size) -> pygame.Surface:
+        """Get the stamp for `key`, creating it with `draw(surface)` on a miss"""
+        stamp = self._stamps.get(key)
+        if stamp is not None:
+            self._stamps.move_to_end(key)
+            return stamp
+
+        stamp = pygame.Surface(size)
+        stamp.fill(STAMP_COLORKEY)
+        draw(stamp)
+        if pygame.display.get_surface() is not None:
+            stamp = stamp.convert()
+        stamp.set_colorkey(STAMP_COLORKEY, pygame.RLEACCEL)
+        self._stamps[key] = stamp
+        while len(self._stamps) > self.max_size:
+            self._stamps.popitem(last=False)
+        return stamp
+
+    def __len__(self) -> int:
+        return len(self._stamps)
+
+    def clear(self) -> None:
+        self._stamps.clear()
@@ -0,0 +1,39 @@
+"""Fixed-timestep scheduling for the fluid simulation"""
+
+
+class FixedTimestep:
+    """Turns variable frame times into a whole number of fixed simulation steps
+
+    Frame time accumulates until it covers a step. At most `max_substeps`
+    steps run per frame; time beyond that is dropped so one slow frame
+    cannot trigger an ever-growing backlog of work. `alpha` is how far the
+    leftover time reaches into the next step, for interpolating rendering.
+    """
+
+    def __init__(self, step: float = 1.0 / 60.0, max_substeps: int = 4):
+        self.step = step
+        self.max_substeps = max_substeps
+        self.accumulator = 0.0
+        self.dropped = 0.0
+
+    def advance(self, dt: float) -> int:
+        """Add a frame's time and return how many steps to run now"""
+        self.accumulator += max(0.0, dt)
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_substeps:
+            # Keep only the fraction of a step; the rest is lost to lag
+            leftover = self.accumulator - steps * self.step
+            self.dropped += (steps - self.max_substeps) * self.step
+            steps = self.max_substeps
+            self.accumulator = leftover
+        else:
+            self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self) -> float:
+        """Fraction of a step between the last simulated state and now"""
+        return min(1.0, self.accumulator / self.step)
+
+    def reset(self) -> None:
+        self.accumulator = 0.0
@@ -0,0 +1,103 @@
+"""Transfers between water particles and the simulation grid"""
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+SPLAT_KERNELS = ("nearest", "cic")
+
+
+def splat_indices(x: np.ndarray, y: np.ndarray, inv_cell: float, shape: Tuple[int, int],
+                  kernel: str = "nearest") -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Flattened grid cells each particle contributes to, with weights
+
+    Args:
+        x, y: Particle positions in pixels
+        inv_cell: 1 / cell size in pixels
+        shape: (grid_h, grid_w)
+        kernel: "nearest" puts each particle in the cell containing it;
+            "cic" (cloud in cell) spreads it bilinearly over the four
+            nearest cell centres
+
+    Returns:
+        (particle, cell, weight) arrays of equal length; contributions that
+        fall outside the grid are dropped
+    """
+    grid_h, grid_w = shape
+    if kernel == "nearest":
+        gx = np.floor(x * inv_cell).astype(np.intp)
+        gy = np.floor(y * inv_cell).astype(np.intp)
+        inside = np.nonzero((gx >= 0) & (gx < grid_w) & (gy >= 0) & (gy < grid_h))[0]
+        cells = gy[inside] * grid_w + gx[inside]
+        return inside, cells, np.ones(len(inside), dtype=np.float32)
+    if kernel != "cic":
+        raise ValueError(f"Unknown splat kernel '{kernel}', expected one of {SPLAT_KERNELS}")
+
+    # Cell centres sit at half-cell offsets
+    fx = x * inv_cell - 0.5
+    fy = y * inv_cell - 0.5
+    x0 = np.floor(fx)
+    y0 = np.floor(fy)
+    sx = (fx - x0).astype(np.float32)
+    sy = (fy - y0).astype(np.float32)
+    x0 = x0.astype(np.intp)
+    y0 = y0.astype(np.intp)
+
+    index = np.arange(len(x))
+    parts = []
+    for ox, oy, weight in (
+        (0, 0, (1 - sx) * (1 - sy)),
+        (1, 0, sx * (1 - sy)),
+        (0, 1, (1 - sx) * sy),
+        (1, 1, sx * sy),
+    ):
+        cx = x0 + ox
+        cy = y0 + oy
+        inside = (cx >= 0) & (cx < grid_w) & (cy >= 0) & (cy < grid_h)
+        parts.append((index[inside], cy[inside] * grid_w + cx[inside], weight[inside]))
+    return tuple(np.concatenate(column) for column in zip(*parts))
+
+
+def gather(x: np.ndarray, y: np.ndarray, fields: Sequence[np.ndarray], inv_cell: float,
+           kernel: str = "nearest", mask: np.ndarray = None) -> List[np.ndarray]:
+    """Interpolate grid fields at particle positions, the inverse of `splat`
+
+    With a `mask` only cells where it is nonzero (e.g. cells holding water)
+    contribute and the remaining weights are renormalized, so particles at
+    the free surface are not dragged towards the empty cells next to them.
+    Particles that reach no contributing cell get zero.
+    """
+    count = len(x)
+    particle, cells, weight = splat_indices(x, y, inv_cell, fields[0].shape, kernel)
+    if mask is not None:
+        weight = weight * mask.ravel()[cells]
+    # bincount returns integers when there is nothing to count
+    total = np.bincount(particle, weight, minlength=count).astype(np.float64)
+    inv_total = np.zeros_like(total)
+    np.divide(1.0, total, out=inv_total, where=total > 0)
+    return [
+        np.bincount(particle, weight * field.ravel()[cells], minlength=count) * inv_total
+        for field in fields
+    ]
+
+
+def splat(x: np.ndarray, y: np.ndarray, values: Sequence[np.ndarray], inv_cell: float,
+          weight_out: np.ndarray, value_outs: Sequence[np.ndarray], kernel: str = "nearest") -> None:
+    """Scatter particles onto the grid as weight-averaged fields
+
+    `weight_out` receives the summed kernel weight per cell (the particle
+    count for the nearest kernel) and each of `value_outs` the weighted
+    mean of the matching entry of `values`, zero where no particle landed.
+    """
+    shape = weight_out.shape
+    size = weight_out.size
+    particle, cells, weight = splat_indices(x, y, inv_cell, shape, kernel)
+
+    total = np.bincount(cells, weight, minlength=size).astype(np.float64)
+    weight_out[...] = total.reshape(shape)
+    occupied = total > 0
+    inv_total = np.zeros_like(total)
+    np.divide(1.0, total, out=inv_total, where=occupied)
+    for value, out in zip(values, value_outs):
+        summed = np.bincount(cells, weight * value[particle], minlength=size) * inv_total
+        out[...] = summed.reshape(shape)
@@ -20,3 +20,27 @@ def resource_path(relative_path: str) -> str:
         base = Path(__file__).resolve().parents[1]
 
     return str(base / relative_path)
+
+
+def cache_path(relative_path: str) -> str:
+    """Resolve a writable location for generated cache files.
+
+    During development caches live under the project's data directory. Bundled
+    builds extract to a temporary, possibly read-only directory, so they use a
+    per-user directory instead. Set TEABLOOM_CACHE_DIR to override both.
+
+    Args:
+        relative_path: Path relative to the cache root (e.g., 'sprites')
+
+    Returns:
+        Absolute string path inside the cache root.
+    """
+    override = os.environ.get('TEABLOOM_CACHE_DIR')
+    if override:
+        base = Path(override)
+    elif hasattr(sys, '_MEIPASS'):
+        base = Path.home() / '.teabloom_garden' / 'cache'
+    else:
+        base = Path(__file__).resolve().parents[1] / 'data' / 'cache'
+
+    return str(base / relative_path)
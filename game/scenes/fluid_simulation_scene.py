@@ -1,10 +1,7 @@
 import math
-import os
 import random
 import threading
-from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass
-from typing import List, Tuple
+from typing import Optional, Tuple
 
 import pygame
 
@@ -13,6 +10,20 @@ try:
 except ImportError as exc:  # pragma: no cover
     raise SystemExit("This simulation requires numpy. Please install it.") from exc
 
+from game.fluid import particles as particle_ops
+from game.fluid.advection import Advector
+from game.fluid.kernels import get_kernels
+from game.fluid.leaves import LeafArrays, confine_to_circle, resolve_segment_contacts
+from game.fluid.parallel import TileExecutor
+from game.fluid.pressure import PressureSolver, face_divergence, pressure_gradient
+from game.fluid.profiling import PhaseTimer
+from game.fluid.replay import InputScript
+from game.fluid.particles import ParticleArrays
+from game.fluid.spatial_hash import SpatialHash
+from game.fluid.stamps import StampCache
+from game.fluid.timestep import FixedTimestep
+from game.fluid.transfer import gather, splat
+
 
 WINDOW_WIDTH = 1024
 WINDOW_HEIGHT = 768
@@ -20,6 +31,17 @@ CELL_SIZE = 6
 GRID_W = WINDOW_WIDTH // CELL_SIZE
 GRID_H = WINDOW_HEIGHT // CELL_SIZE
 FPS = 60
+# The simulation always advances in steps of SIM_DT; a slow frame runs at
+# most MAX_SUBSTEPS of them and drops the rest
+SIM_DT = 1.0 / 60.0
+MAX_SUBSTEPS = 4
+# Upscale the grid image by exactly the cell size with nearest-neighbour
+# sampling instead of smoothly stretching it to the window (cheaper, blocky)
+RENDER_INTEGER_SCALE = False
+# Particle and leaf colours are quantized to this many levels so their
+# pre-rendered stamps can be reused
+STAMP_COLOR_LEVELS = 32
+LEAF_ANGLE_BUCKETS = 90
 
 GRAVITY = 60.0
 VELOCITY_DAMP = 0.985
@@ -34,23 +56,51 @@ PARTICLE_RESTITUTION = 0.65
 PARTICLE_DAMP = 0.992
 PARTICLES_PER_POUR = 10
 MAX_PARTICLES = 800
+# "nearest" or "cic" (bilinear cloud-in-cell splat, smoother at coarse grids)
+SPLAT_KERNEL = "nearest"
+# Kernel reading grid velocity back at the particles; "cic" interpolates
+# bilinearly, which is what lets the grid smooth the particles' motion
+GATHER_KERNEL = "cic"
+# Particles take the grid's velocity change (FLIP) blended with the grid
+# velocity itself (PIC): 1.0 keeps every particle's own motion, lower values
+# make the water move coherently with fewer particles
+FLIP_RATIO = 0.95
+# "semi-lagrangian" or "maccormack" (less smearing of dye, about twice the cost)
+ADVECTION = "semi-lagrangian"
+# Contact resolution backend: "auto", "python", "numpy" or "numba"
+KERNEL_BACKEND = "auto"
+# Tiled multi-core execution: "auto" times serial and parallel per workload
+PARALLEL_MODE = "auto"
 
 LEAF_LENGTH = 20
 LEAF_THICKNESS = 5
 LEAF_COLOR_DRY = (40, 90, 30)
 LEAF_COLOR_WET = (160, 110, 50)
-LEAF_RADIUS = 8
 LEAF_RESTITUTION = 0.0
 LEAF_FRICTION = 0.85
 LEAF_SETTLE_PULL = 8.0
+# Wet leaves steep dye into the water within this many pixels, at up to
+# this much dye per second (strongest next to the leaf)
+LEAF_INFUSION_RADIUS = 20.0
+LEAF_INFUSION_RATE = 1.4
 
 TEA_COLOR = np.array([160, 110, 50], dtype=np.float32)
 WATER_COLOR = np.array([90, 140, 220], dtype=np.float32)
 BACKGROUND = (12, 16, 22)
 
+# Cells packed past their rest particle count (plus PRESSURE_REST of it)
+# push water out at PRESSURE_STIFFNESS times the excess per second
 PRESSURE_STIFFNESS = 18.0
 PRESSURE_REST = 0.08
 MIN_WATER = 0.02
+# "rbgs" (red-black Gauss-Seidel), "multigrid" or None to skip the solve.
+# A few warm-started sweeps are enough to keep the water from collapsing;
+# multigrid reaches a tight tolerance in fewer, costlier iterations
+PRESSURE_SOLVER = "rbgs"
+# Most sweeps (rbgs) or V-cycles (multigrid) per step, and the relative
+# residual at which a solve stops early
+PRESSURE_ITERATIONS = 8
+PRESSURE_TOLERANCE = 1e-2
 
 CUP_WIDTH = 420
 CUP_HEIGHT = 500
@@ -59,42 +109,48 @@ CUP_MARGIN_BOTTOM = 40
 CUP_COLOR = (200, 200, 210)
 
 
-@dataclass
-class LeafParticle:
-    x: float
-    y: float
-    angle: float
-    length: float
-    strength: float
-    vx: float = 0.0
-    vy: float = 0.0
-
-    def as_segment(self) -> Tuple[Tuple[float, float], Tuple[float, float]]:
-        dx = math.cos(self.angle) * self.length * 0.5
-        dy = math.sin(self.angle) * self.length * 0.5
-        return (self.x - dx, self.y - dy), (self.x + dx, self.y + dy)
-
-
-@dataclass
-class WaterParticle:
-    x: float
-    y: float
-    vx: float
-    vy: float
-    radius: float
-    dye: float
-
-
 class FluidSimulation:
-    def __init__(self, grid_w: int, grid_h: int):
+    def __init__(
+        self,
+        grid_w: int,
+        grid_h: int,
+        splat_kernel: str = SPLAT_KERNEL,
+        kernel_backend: str = KERNEL_BACKEND,
+        parallel_mode: str = PARALLEL_MODE,
+        cell_size: int = CELL_SIZE,
+        max_particles: int = MAX_PARTICLES,
+        seed: Optional[int] = None,
+        record: bool = False,
+        pressure_solver: Optional[str] = PRESSURE_SOLVER,
+        pressure_iterations: int = PRESSURE_ITERATIONS,
+        pressure_tolerance: float = PRESSURE_TOLERANCE,
+        flip_ratio: float = FLIP_RATIO,
+        gather_kernel: str = GATHER_KERNEL,
+        advection: str = ADVECTION,
+    ):
         self.grid_w = grid_w
         self.grid_h = grid_h
-        self.inv_cell = 1.0 / CELL_SIZE
+        self.cell_size = cell_size
+        self.inv_cell = 1.0 / cell_size
+        self.max_particles = max_particles
+        # Enable to collect per-phase step timings (see fluid_benchmark.py)
+        self.timer = PhaseTimer()
+        # All randomness comes from this RNG so a seed reproduces a run
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        self.rng = random.Random(self.seed)
+        # Inputs applied so far, for replay (see game/fluid/replay.py)
+        self.script = InputScript(self.seed) if record else None
+        self.splat_kernel = splat_kernel
+        self.flip_ratio = flip_ratio
+        self.gather_kernel = gather_kernel
+        self.kernels = get_kernels(kernel_backend)
 
         self.u = np.zeros((grid_h, grid_w), dtype=np.float32)
         self.v = np.zeros((grid_h, grid_w), dtype=np.float32)
         self.water = np.zeros((grid_h, grid_w), dtype=np.float32)
         self.dye = np.zeros((grid_h, grid_w), dtype=np.float32)
+        # Kept between steps as the starting guess of the next solve
+        self.pressure = np.zeros((grid_h, grid_w), dtype=np.float32)
 
         self._water_next = np.zeros_like(self.water)
         self._dye_next = np.zeros_like(self.dye)
@@ -105,26 +161,57 @@ class FluidSimulation:
 
         self.cup_rect = self._build_cup_rect()
         self.cup_mask = self._build_cup_mask()
-
-        self.leaves: List[LeafParticle] = []
-        self.particles: List[WaterParticle] = []
+        self._solid = self.cup_mask == 0.0
+        # Grid-only work is limited to this (rows, cols) window: the cup's
+        # cells grown to cover every particle; everything outside stays zero
+        self._cup_region = self._build_cup_region()
+        self.active = self._cup_region
+
+        self.leaves = LeafArrays()
+        self.particles = ParticleArrays(max_particles)
+        # Positions before the latest step, for render interpolation
+        self._prev_x = np.zeros(max_particles, dtype=np.float32)
+        self._prev_y = np.zeros(max_particles, dtype=np.float32)
+        self._prev_count = 0
+        self._prev_leaf_x = np.zeros(0, dtype=np.float32)
+        self._prev_leaf_y = np.zeros(0, dtype=np.float32)
         self._lock = threading.Lock()
 
-        self._vel_count = np.zeros((grid_h, grid_w), dtype=np.float32)
-        self._particle_buckets: dict[Tuple[int, int], List[int]] = {}
         self._particle_bucket_size = max(2, PARTICLE_RADIUS * 2)
-        self._leaf_buckets: dict[Tuple[int, int], List[int]] = {}
-        self._leaf_bucket_size = max(4, LEAF_RADIUS * 2)
+        # Leaf centres closer than the longest leaf plus its thickness may touch
+        self._leaf_bucket_size = LEAF_LENGTH * 1.2 + LEAF_THICKNESS
+        # Rebuilt every step for the contact passes
+        self._particle_hash = SpatialHash(
+            WINDOW_WIDTH, WINDOW_HEIGHT, self._particle_bucket_size, max_particles
+        )
+        self._leaf_hash = SpatialHash(WINDOW_WIDTH, WINDOW_HEIGHT, self._leaf_bucket_size)
+
+        self.tiles = TileExecutor(mode=parallel_mode)
+        self.advector = Advector(advection, tiles=self.tiles)
 
-        workers = max(2, (os.cpu_count() or 4) - 1)
-        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.pressure_solver = None
+        if pressure_solver is not None:
+            self.pressure_solver = PressureSolver(
+                pressure_solver, pressure_iterations, pressure_tolerance
+            )
+        # Particles a cell holds at rest: about one at the default cell size
+        self._rest_density = max(
+            1.0, 0.9 * cell_size * cell_size / (math.pi * PARTICLE_RADIUS * PARTICLE_RADIUS)
+        )
+        self._infusion_reach, self._infusion_offsets, self._infusion_weights = (
+            self._build_infusion_kernel()
+        )
 
     def add_leaf(self, x: float, y: float) -> None:
-        angle = random.uniform(0, math.pi)
-        length = random.uniform(LEAF_LENGTH * 0.7, LEAF_LENGTH * 1.2)
-        self.leaves.append(LeafParticle(x, y, angle, length, 1.0))
+        if self.script is not None:
+            self.script.record("leaf", x, y)
+        angle = self.rng.uniform(0, math.pi)
+        length = self.rng.uniform(LEAF_LENGTH * 0.7, LEAF_LENGTH * 1.2)
+        self.leaves.add(x, y, angle, length)
 
     def add_water(self, gx: int, gy: int, amount: float) -> None:
+        if self.script is not None:
+            self.script.record("pour", gx, gy, amount)
         x0 = max(0, gx - POUR_RADIUS)
         x1 = min(self.grid_w, gx + POUR_RADIUS + 1)
         y0 = max(0, gy - POUR_RADIUS)
@@ -133,95 +220,115 @@ class FluidSimulation:
         self.water[y0:y1, x0:x1] += amount
         self.v[y0:y1, x0:x1] += GRAVITY * 0.08
 
-        if len(self.particles) < MAX_PARTICLES:
-            cx = gx * CELL_SIZE + CELL_SIZE * 0.5
-            cy = gy * CELL_SIZE + CELL_SIZE * 0.5
-            for _ in range(PARTICLES_PER_POUR):
-                if len(self.particles) >= MAX_PARTICLES:
-                    break
-                px = cx + random.uniform(-CELL_SIZE, CELL_SIZE)
-                py = cy + random.uniform(-CELL_SIZE, CELL_SIZE)
-                self.particles.append(
-                    WaterParticle(
-                        px,
-                        py,
-                        0.0,
-                        random.uniform(20.0, 40.0),
-                        PARTICLE_RADIUS,
-                        0.0,
-                    )
-                )
+        count = min(PARTICLES_PER_POUR, self.max_particles - len(self.particles))
+        if count > 0:
+            cell = self.cell_size
+            cx = gx * cell + cell * 0.5
+            cy = gy * cell + cell * 0.5
+            rng = self.rng
+            px, py, pvy = [], [], []
+            for _ in range(count):
+                px.append(cx + rng.uniform(-cell, cell))
+                py.append(cy + rng.uniform(-cell, cell))
+                pvy.append(rng.uniform(20.0, 40.0))
+            self.particles.add(px, py, 0.0, pvy, PARTICLE_RADIUS, 0.0)
 
     def step(self, dt: float) -> None:
-        self._step_particles(dt)
-        self._rebuild_velocity_and_water()
-
-        self._water_next[:, :] = self.water
-        self._advect_field(self.dye, self._dye_next, dt)
-
-        self._diffuse_inplace(self._water_next, DIFFUSE_WATER)
-        self._diffuse_inplace(self._dye_next, DIFFUSE_DYE)
-
-        self._dye_next *= DYE_DECAY
-        self.water[:, :] = self._water_next
-        self.dye[:, :] = self._dye_next
-
-        self._apply_cup_bounds()
-
-        self._update_leaves(dt)
-
-    def _advect_field(self, src: np.ndarray, dst: np.ndarray, dt: float) -> None:
-        rows = self.grid_h
-        chunk = max(8, rows // (os.cpu_count() or 4))
-        futures = []
-
-        for y0 in range(0, rows, chunk):
-            y1 = min(rows, y0 + chunk)
-            futures.append(
-                self.executor.submit(
-                    self._advect_chunk, src, dst, y0, y1, dt
-                )
-            )
-
-        for future in futures:
-            future.result()
-
-    def _advect_chunk(
-        self, src: np.ndarray, dst: np.ndarray, y0: int, y1: int, dt: float
-    ) -> None:
-        x = self.grid_x[y0:y1]
-        y = self.grid_y[y0:y1]
-        u = self.u[y0:y1]
-        v = self.v[y0:y1]
-
-        back_x = x - u * dt * self.inv_cell
-        back_y = y - v * dt * self.inv_cell
-
-        back_x = np.clip(back_x, 0, self.grid_w - 1.001)
-        back_y = np.clip(back_y, 0, self.grid_h - 1.001)
-
-        x0 = np.floor(back_x).astype(np.int32)
-        y0i = np.floor(back_y).astype(np.int32)
-        x1 = np.clip(x0 + 1, 0, self.grid_w - 1)
-        y1i = np.clip(y0i + 1, 0, self.grid_h - 1)
-
-        sx = back_x - x0
-        sy = back_y - y0i
-
-        a = src[y0i, x0]
-        b = src[y0i, x1]
-        c = src[y1i, x0]
-        d = src[y1i, x1]
-
-        dst[y0:y1] = (
-            (a * (1 - sx) + b * sx) * (1 - sy)
-            + (c * (1 - sx) + d * sx) * sy
-        )
+        if self.script is not None:
+            self.script.record("step", dt)
+        timer = self.timer
+        self._save_previous_state()
+        with timer("particles"):
+            self._step_particles(dt)
+        self._update_active_region()
+        with timer("splat"):
+            self._rebuild_velocity_and_water()
+        active = self.active
+        splat_u = self.u[active].copy()
+        splat_v = self.v[active].copy()
+        with timer("pressure"):
+            self._project_pressure()
+        with timer("gather"):
+            self._update_particle_velocity(splat_u, splat_v)
+
+        with timer("advect"):
+            self._advect_fields(dt)
+
+        with timer("diffuse"):
+            self._diffuse_inplace(self._water_next, DIFFUSE_WATER)
+            self._diffuse_inplace(self._dye_next, DIFFUSE_DYE)
+
+            self._dye_next[active] *= DYE_DECAY
+            self.water[active] = self._water_next[active]
+            self.dye[active] = self._dye_next[active]
+
+            self._apply_cup_bounds()
+
+        with timer("leaves"):
+            self._update_leaves(dt)
+
+    def _save_previous_state(self) -> None:
+        p = self.particles
+        if len(p) > len(self._prev_x):
+            self._prev_x = np.zeros(p.capacity, dtype=np.float32)
+            self._prev_y = np.zeros(p.capacity, dtype=np.float32)
+        self._prev_x[: len(p)] = p.x
+        self._prev_y[: len(p)] = p.y
+        self._prev_count = len(p)
+        self._prev_leaf_x = self.leaves.x.copy()
+        self._prev_leaf_y = self.leaves.y.copy()
+
+    def interpolated_particles(self, alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Particle positions `alpha` of the way from the previous step to the current one
+
+        Particles spawned since the previous step are drawn where they are.
+        """
+        p = self.particles
+        if alpha >= 1.0 or self._prev_count == 0:
+            return p.x, p.y
+        x = p.x.copy()
+        y = p.y.copy()
+        n = min(self._prev_count, len(p))
+        x[:n] = self._prev_x[:n] + (x[:n] - self._prev_x[:n]) * alpha
+        y[:n] = self._prev_y[:n] + (y[:n] - self._prev_y[:n]) * alpha
+        return x, y
+
+    def interpolated_leaves(self, alpha: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Leaf centres `alpha` of the way from the previous step to the current one"""
+        leaves = self.leaves
+        if alpha >= 1.0 or len(self._prev_leaf_x) == 0:
+            return leaves.x, leaves.y
+        x = leaves.x.copy()
+        y = leaves.y.copy()
+        n = min(len(self._prev_leaf_x), len(leaves))
+        x[:n] = self._prev_leaf_x[:n] + (x[:n] - self._prev_leaf_x[:n]) * alpha
+        y[:n] = self._prev_leaf_y[:n] + (y[:n] - self._prev_leaf_y[:n]) * alpha
+        return x, y
+
+    def _update_active_region(self) -> None:
+        rows, cols = self._cup_region
+        y0, y1, x0, x1 = rows.start, rows.stop, cols.start, cols.stop
+        p = self.particles
+        if p:
+            # one cell of margin keeps the region's border empty
+            x0 = min(x0, max(0, int(p.x.min() * self.inv_cell) - 1))
+            x1 = max(x1, min(self.grid_w, int(p.x.max() * self.inv_cell) + 2))
+            y0 = min(y0, max(0, int(p.y.min() * self.inv_cell) - 1))
+            y1 = max(y1, min(self.grid_h, int(p.y.max() * self.inv_cell) + 2))
+        self.active = (slice(y0, y1), slice(x0, x1))
+
+    def _advect_fields(self, dt: float) -> None:
+        # Back-traces are clamped to the region, whose border cells are empty
+        active = self.active
+        self.advector.prepare(self.u[active], self.v[active], dt * self.inv_cell)
+        self.advector.advect(self.water[active], self._water_next[active])
+        self.advector.advect(self.dye[active], self._dye_next[active])
 
     def _diffuse_inplace(self, field: np.ndarray, rate: float) -> None:
         if rate <= 0.0:
             return
-        presence = (self.water > MIN_WATER).astype(np.float32)
+        field = field[self.active]
+        presence = (self.water[self.active] > MIN_WATER).astype(np.float32)
         n0 = np.roll(field, 1, axis=0)
         n1 = np.roll(field, -1, axis=0)
         n2 = np.roll(field, 1, axis=1)
@@ -241,220 +348,165 @@ class FluidSimulation:
         if not self.particles:
             return
 
-        for p in self.particles:
-            p.vy += GRAVITY * dt * 0.8
-            p.vx *= PARTICLE_DAMP
-            p.vy *= PARTICLE_DAMP
-
-            p.x += p.vx * dt
-            p.y += p.vy * dt
-
-            # circular cup collision: constrain to interior radius
-            dx = p.x - self.cup_cx
-            dy = p.y - self.cup_cy
-            dist = math.hypot(dx, dy)
-            inner_r = max(0.0, self.cup_radius - CUP_WALL - p.radius)
-            if dist > inner_r:
-                if dist == 0.0:
-                    nx, ny = 1.0, 0.0
-                else:
-                    nx, ny = dx / dist, dy / dist
-                # project back inside
-                p.x = self.cup_cx + nx * inner_r
-                p.y = self.cup_cy + ny * inner_r
-
-                # reflect outward component
-                vn = p.vx * nx + p.vy * ny
-                if vn > 0:
-                    p.vx -= (1.0 + PARTICLE_RESTITUTION) * vn * nx
-                    p.vy -= (1.0 + PARTICLE_RESTITUTION) * vn * ny
-
-        cell = self._particle_bucket_size
-        buckets: dict[Tuple[int, int], List[int]] = {}
-        for idx, p in enumerate(self.particles):
-            key = (int(p.x // cell), int(p.y // cell))
-            buckets.setdefault(key, []).append(idx)
-
-        self._particle_buckets = buckets
-
-        for idx, p in enumerate(self.particles):
-            cx = int(p.x // cell)
-            cy = int(p.y // cell)
-            for oy in (-1, 0, 1):
-                for ox in (-1, 0, 1):
-                    other = buckets.get((cx + ox, cy + oy))
-                    if not other:
-                        continue
-                    for j in other:
-                        if j <= idx:
-                            continue
-                        q = self.particles[j]
-                        dx = q.x - p.x
-                        dy = q.y - p.y
-                        dist2 = dx * dx + dy * dy
-                        min_dist = p.radius + q.radius
-                        if dist2 <= 0.0001 or dist2 >= min_dist * min_dist:
-                            continue
-                        dist = math.sqrt(dist2)
-                        nx = dx / dist
-                        ny = dy / dist
-                        overlap = min_dist - dist
-                        p.x -= nx * overlap * 0.5
-                        p.y -= ny * overlap * 0.5
-                        q.x += nx * overlap * 0.5
-                        q.y += ny * overlap * 0.5
-
-                        rvx = q.vx - p.vx
-                        rvy = q.vy - p.vy
-                        vn = rvx * nx + rvy * ny
-                        if vn >= 0:
-                            continue
-                        impulse = -(1.0 + PARTICLE_RESTITUTION) * vn * 0.5
-                        ix = impulse * nx
-                        iy = impulse * ny
-                        p.vx -= ix
-                        p.vy -= iy
-                        q.vx += ix
-                        q.vy += iy
-
-                        # dye mixing is handled by the grid diffusion step; do not
-                        # mutate per-particle dye here.
+        particle_ops.integrate(self.particles, dt, GRAVITY * 0.8, PARTICLE_DAMP)
+        # circular cup collision: constrain to interior radius
+        particle_ops.collide_circle(
+            self.particles,
+            self.cup_cx,
+            self.cup_cy,
+            self.cup_radius - CUP_WALL,
+            PARTICLE_RESTITUTION,
+        )
+        # dye mixing is handled by the grid diffusion step; contacts only
+        # move particles and exchange velocity
+        p = self.particles
+        self._particle_hash.build(p.x, p.y)
+        self.kernels.resolve_contacts(
+            p.x,
+            p.y,
+            p.vx,
+            p.vy,
+            p.radius,
+            self._particle_hash,
+            PARTICLE_RESTITUTION,
+            tiles=self.tiles,
+        )
 
     def _rebuild_velocity_and_water(self) -> None:
-        self.water.fill(0.0)
-        self.dye.fill(0.0)
-        self.u.fill(0.0)
-        self.v.fill(0.0)
-        self._vel_count.fill(0.0)
-
-        for p in self.particles:
-            gx = int(p.x * self.inv_cell)
-            gy = int(p.y * self.inv_cell)
-            if gx < 0 or gx >= self.grid_w or gy < 0 or gy >= self.grid_h:
-                continue
-            self.water[gy, gx] += 1.0
-            self.dye[gy, gx] += p.dye
-            self.u[gy, gx] += p.vx
-            self.v[gy, gx] += p.vy
-            self._vel_count[gy, gx] += 1.0
-
-        mask = self._vel_count > 0
-        self.u[mask] /= self._vel_count[mask]
-        self.v[mask] /= self._vel_count[mask]
-        self.dye[mask] /= self._vel_count[mask]
+        p = self.particles
+        splat(
+            p.x,
+            p.y,
+            (p.dye, p.vx, p.vy),
+            self.inv_cell,
+            self.water,
+            (self.dye, self.u, self.v),
+            self.splat_kernel,
+        )
 
-    def _update_leaves(self, dt: float) -> None:
-        if not self.leaves:
+    def _project_pressure(self) -> None:
+        """Make the grid velocity divergence-free, pushing packed water apart"""
+        if self.pressure_solver is None or not self.particles:
+            return
+        active = self.active
+        water = self.water[active]
+        solid = self._solid[active]
+        fluid = (water > MIN_WATER) & ~solid
+        u = self.u[active]
+        v = self.v[active]
+
+        excess = np.maximum(water * (1.0 / self._rest_density) - (1.0 + PRESSURE_REST), 0.0)
+        rhs = face_divergence(u, v, fluid, solid)
+        rhs -= excess * (PRESSURE_STIFFNESS * self.cell_size)
+        pressure = self.pressure[active]
+        self.pressure_solver.solve(rhs, fluid, solid, pressure)
+        grad_x, grad_y = pressure_gradient(pressure, fluid, solid)
+        u -= grad_x
+        v -= grad_y
+
+    def _update_particle_velocity(self, splat_u: np.ndarray, splat_v: np.ndarray) -> None:
+        """Hand the grid's velocity back to the particles (PIC/FLIP)
+
+        `splat_u`/`splat_v` are the active region's velocity as splatted,
+        before the pressure solve changed it.
+        """
+        p = self.particles
+        if not p:
             return
+        active = self.active
+        rows, cols = active
+        u = self.u[active]
+        v = self.v[active]
+        x = p.x - cols.start * self.cell_size
+        y = p.y - rows.start * self.cell_size
+        wet = self.water[active] > MIN_WATER
+
+        flip = self.flip_ratio
+        if flip >= 1.0:
+            du, dv = gather(x, y, (u - splat_u, v - splat_v), self.inv_cell, self.gather_kernel, wet)
+            p.vx[:] += du
+            p.vy[:] += dv
+            return
+        grid_u, grid_v, du, dv = gather(
+            x, y, (u, v, u - splat_u, v - splat_v), self.inv_cell, self.gather_kernel, wet
+        )
+        p.vx[:] = (p.vx + du) * flip + grid_u * (1.0 - flip)
+        p.vy[:] = (p.vy + dv) * flip + grid_v * (1.0 - flip)
 
-        for leaf in self.leaves:
-            gx = int(leaf.x * self.inv_cell)
-            gy = int(leaf.y * self.inv_cell)
-            gx = max(0, min(self.grid_w - 1, gx))
-            gy = max(0, min(self.grid_h - 1, gy))
+    def _update_leaves(self, dt: float) -> None:
+        leaves = self.leaves
+        n = len(leaves)
+        if not n:
+            return
 
-            vel_x = float(self.u[gy, gx]) * dt
-            vel_y = float(self.v[gy, gx]) * dt
+        # Flow at both ends of every leaf in one bilinear gather: the mean
+        # carries the leaf, the difference across it turns it
+        ax, ay, bx, by = leaves.endpoints()
+        flow_u, flow_v, water = gather(
+            np.concatenate((ax, bx)), np.concatenate((ay, by)),
+            (self.u, self.v, self.water), self.inv_cell, "cic",
+        )
+        flow_u *= dt
+        flow_v *= dt
+        mean_u = (flow_u[:n] + flow_u[n:]) * 0.5
+        mean_v = (flow_v[:n] + flow_v[n:]) * 0.5
+        span_x = bx - ax
+        span_y = by - ay
+        flow_spin = (span_x * (flow_v[n:] - flow_v[:n]) - span_y * (flow_u[n:] - flow_u[:n])) / (
+            np.maximum(span_x * span_x + span_y * span_y, 1e-6)
+        )
 
-            leaf.vy += GRAVITY * 0.35 * dt
-            leaf.vx = (leaf.vx + vel_x * 0.6) * 0.96
-            leaf.vy = (leaf.vy + vel_y * 0.6) * 0.96
+        leaves.vy[:] += GRAVITY * 0.35 * dt
+        leaves.vx[:] = (leaves.vx + mean_u * 0.6) * 0.96
+        leaves.vy[:] = (leaves.vy + mean_v * 0.6) * 0.96
+        leaves.spin[:] = (leaves.spin + flow_spin * 0.6) * 0.96
 
-            leaf.x = max(0.0, min(WINDOW_WIDTH, leaf.x + leaf.vx))
-            leaf.y = max(0.0, min(WINDOW_HEIGHT, leaf.y + leaf.vy))
+        leaves.x[:] = np.clip(leaves.x + leaves.vx, 0.0, WINDOW_WIDTH)
+        leaves.y[:] = np.clip(leaves.y + leaves.vy, 0.0, WINDOW_HEIGHT)
+        leaves.angle[:] += leaves.spin
 
-            bottom = self.cup_cy + (self.cup_radius - CUP_WALL)
-            if leaf.y < bottom:
-                leaf.vy += LEAF_SETTLE_PULL * dt
+        bottom = self.cup_cy + (self.cup_radius - CUP_WALL)
+        leaves.vy[leaves.y < bottom] += LEAF_SETTLE_PULL * dt
 
-            self._clamp_leaf_to_cup(leaf)
+        self._confine_leaves()
 
-            if self.water[gy, gx] > 0.15:
-                leaf.strength = max(0.0, leaf.strength - 0.6 * dt)
-                self._diffuse_leaf_dye(leaf, dt)
+        wet = (water[:n] + water[n:]) * 0.5 > 0.15
+        strength = leaves.strength
+        strength[wet] = np.maximum(strength[wet] - 0.6 * dt, 0.0)
 
+        self._infuse_dye(leaves.x[wet], leaves.y[wet], dt)
         self._resolve_leaf_collisions()
 
-    def _diffuse_leaf_dye(self, leaf: LeafParticle, dt: float) -> None:
-        if not self.particles:
+    def _infuse_dye(self, x: np.ndarray, y: np.ndarray, dt: float) -> None:
+        """Stamp every wet leaf's dye into a grid field the particles then sample"""
+        p = self.particles
+        if not p or not len(x):
             return
-        radius = 20.0
-        radius2 = radius * radius
-        cell = self._particle_bucket_size
-        cx = int(leaf.x // cell)
-        cy = int(leaf.y // cell)
-
-        for oy in (-1, 0, 1):
-            for ox in (-1, 0, 1):
-                indices = self._particle_buckets.get((cx + ox, cy + oy))
-                if not indices:
-                    continue
-                for idx in indices:
-                    p = self.particles[idx]
-                    dx = p.x - leaf.x
-                    dy = p.y - leaf.y
-                    if dx * dx + dy * dy <= radius2:
-                        p.dye = min(1.0, p.dye + 1.4 * dt)
+        # Leaves sit well inside the grid; clamping only guards the stamp's edges
+        reach = self._infusion_reach
+        gx = np.clip((x * self.inv_cell).astype(np.intp), reach, self.grid_w - 1 - reach)
+        gy = np.clip((y * self.inv_cell).astype(np.intp), reach, self.grid_h - 1 - reach)
+        cells = (gy * self.grid_w + gx)[:, None] + self._infusion_offsets
+        # overlapping stamps add up, as a particle near several leaves
+        # takes dye from each of them
+        infusion = np.bincount(
+            cells.ravel(), np.tile(self._infusion_weights, len(x)), minlength=self.grid_w * self.grid_h
+        ).reshape(self.grid_h, self.grid_w)
+        (gained,) = gather(p.x, p.y, (infusion,), self.inv_cell, self.gather_kernel)
+        dye = p.dye
+        dye += gained * (LEAF_INFUSION_RATE * dt)
+        np.minimum(dye, 1.0, out=dye)
 
     def _resolve_leaf_collisions(self) -> None:
-        if len(self.leaves) < 2:
+        leaves = self.leaves
+        if len(leaves) < 2:
             return
-
-        cell = self._leaf_bucket_size
-        buckets: dict[Tuple[int, int], List[int]] = {}
-        for idx, leaf in enumerate(self.leaves):
-            key = (int(leaf.x // cell), int(leaf.y // cell))
-            buckets.setdefault(key, []).append(idx)
-
-        self._leaf_buckets = buckets
-        min_dist = LEAF_RADIUS * 2
-        min_dist2 = min_dist * min_dist
-
-        for idx, leaf in enumerate(self.leaves):
-            cx = int(leaf.x // cell)
-            cy = int(leaf.y // cell)
-            for oy in (-1, 0, 1):
-                for ox in (-1, 0, 1):
-                    others = buckets.get((cx + ox, cy + oy))
-                    if not others:
-                        continue
-                    for j in others:
-                        if j <= idx:
-                            continue
-                        other = self.leaves[j]
-                        dx = other.x - leaf.x
-                        dy = other.y - leaf.y
-                        dist2 = dx * dx + dy * dy
-                        if dist2 <= 0.0001 or dist2 >= min_dist2:
-                            continue
-                        dist = math.sqrt(dist2)
-                        nx = dx / dist
-                        ny = dy / dist
-                        overlap = min_dist - dist
-                        leaf.x -= nx * overlap * 0.5
-                        leaf.y -= ny * overlap * 0.5
-                        other.x += nx * overlap * 0.5
-                        other.y += ny * overlap * 0.5
-
-                        rvx = other.vx - leaf.vx
-                        rvy = other.vy - leaf.vy
-                        vn = rvx * nx + rvy * ny
-                        if vn < 0:
-                            impulse = -(1.0 + LEAF_RESTITUTION) * vn * 0.5
-                            ix = impulse * nx
-                            iy = impulse * ny
-                            leaf.vx -= ix
-                            leaf.vy -= iy
-                            other.vx += ix
-                            other.vy += iy
-
-                        leaf.vx *= LEAF_FRICTION
-                        leaf.vy *= LEAF_FRICTION
-                        other.vx *= LEAF_FRICTION
-                        other.vy *= LEAF_FRICTION
-
-                        self._clamp_leaf_to_cup(leaf)
-                        self._clamp_leaf_to_cup(other)
+        self._leaf_hash.build(leaves.x, leaves.y)
+        contacts = resolve_segment_contacts(
+            leaves, self._leaf_hash, LEAF_THICKNESS, LEAF_RESTITUTION, LEAF_FRICTION
+        )
+        if contacts.any():
+            self._confine_leaves()
 
     def _build_cup_rect(self) -> pygame.Rect:
         cx = WINDOW_WIDTH * 0.5
@@ -472,8 +524,8 @@ class FluidSimulation:
         mask = np.zeros((self.grid_h, self.grid_w), dtype=np.float32)
 
         # compute pixel positions of each cell center
-        x_pix = (self.grid_x + 0.5) * CELL_SIZE
-        y_pix = (self.grid_y + 0.5) * CELL_SIZE
+        x_pix = (self.grid_x + 0.5) * self.cell_size
+        y_pix = (self.grid_y + 0.5) * self.cell_size
 
         dx = x_pix - self.cup_cx
         dy = y_pix - self.cup_cy
@@ -483,85 +535,218 @@ class FluidSimulation:
         mask[dist2 <= (inner_radius * inner_radius)] = 1.0
         return mask
 
+    def _build_infusion_kernel(self) -> Tuple[int, np.ndarray, np.ndarray]:
+        """Radial stamp of a leaf's dye: reach in cells, flat offsets and weights
+
+        Weights fall off with the squared distance and average 1 over the
+        stamp, so a stamp delivers as much dye as a flat disc would.
+        """
+        reach = int(math.ceil(LEAF_INFUSION_RADIUS * self.inv_cell))
+        dy, dx = np.mgrid[-reach:reach + 1, -reach:reach + 1]
+        dist2 = (dx * dx + dy * dy) * float(self.cell_size * self.cell_size)
+        weights = 1.0 - dist2 / (LEAF_INFUSION_RADIUS * LEAF_INFUSION_RADIUS)
+        inside = weights > 0.0
+        weights = weights[inside]
+        weights *= len(weights) / weights.sum()
+        offsets = (dy * self.grid_w + dx)[inside]
+        return reach, offsets.astype(np.intp), weights.astype(np.float32)
+
+    def _build_cup_region(self) -> Tuple[slice, slice]:
+        rows = np.nonzero(self.cup_mask.any(axis=1))[0]
+        cols = np.nonzero(self.cup_mask.any(axis=0))[0]
+        return (
+            slice(max(0, int(rows[0]) - 1), min(self.grid_h, int(rows[-1]) + 2)),
+            slice(max(0, int(cols[0]) - 1), min(self.grid_w, int(cols[-1]) + 2)),
+        )
+
     def _apply_cup_bounds(self) -> None:
-        self.water *= self.cup_mask
-        self.dye *= self.cup_mask
-        self.u *= self.cup_mask
-        self.v *= self.cup_mask
-
-    def _clamp_leaf_to_cup(self, leaf: LeafParticle) -> None:
-        # clamp leaf to circular interior
-        dx = leaf.x - self.cup_cx
-        dy = leaf.y - self.cup_cy
-        dist = math.hypot(dx, dy)
-        inner_r = max(0.0, self.cup_radius - CUP_WALL - LEAF_RADIUS)
-        if dist > inner_r and dist > 0.0:
-            nx, ny = dx / dist, dy / dist
-            leaf.x = self.cup_cx + nx * inner_r
-            leaf.y = self.cup_cy + ny * inner_r
+        active = self.active
+        mask = self.cup_mask[active]
+        self.water[active] *= mask
+        self.dye[active] *= mask
+        self.pressure[active] *= mask
+        self.u[active] *= mask
+        self.v[active] *= mask
 
-        bottom = self.cup_cy + (self.cup_radius - CUP_WALL)
-        if leaf.y >= bottom - 0.5:
-            leaf.vy = 0.0
-            leaf.vx *= LEAF_FRICTION
+    def _confine_leaves(self) -> None:
+        inner_r = max(0.0, self.cup_radius - CUP_WALL - LEAF_THICKNESS * 0.5)
+        confine_to_circle(self.leaves, self.cup_cx, self.cup_cy, inner_r, LEAF_FRICTION)
 
 
 class FluidRenderer:
-    def __init__(self, sim: FluidSimulation):
+    def __init__(self, sim: FluidSimulation, integer_scale: bool = RENDER_INTEGER_SCALE):
         self.sim = sim
-        self.surface = pygame.Surface((GRID_W, GRID_H))
-
-    def draw(self, screen: pygame.Surface) -> None:
-        water = self.sim.water
-        dye = self.sim.dye
-
-        water_intensity = np.clip(water * 1.8, 0.0, 1.0)
-        dye_intensity = np.clip(dye * 3.0, 0.0, 1.0)
+        self.integer_scale = integer_scale
+        self.surface = pygame.Surface((sim.grid_w, sim.grid_h))
+        # colour of a cell with no water or dye
+        self.empty_color = (15, 15, 15)
+
+        # Per-frame scratch, sized for the whole grid and used through views
+        self._water_buf = np.zeros((sim.grid_h, sim.grid_w), dtype=np.float32)
+        self._dye_buf = np.zeros_like(self._water_buf)
+        self._channel_buf = np.zeros_like(self._water_buf)
+        self._tea_buf = np.zeros_like(self._water_buf)
+        self._scaled: pygame.Surface = None
+        # (source subsurface, scaled target subsurface, position) of the last
+        # active region drawn, and that region; the region is usually the
+        # cup's and only changes while water splashes out of it
+        self._scale_key = None
+        self._scale_targets = None
+        self.stamps = StampCache()
+
+    def _scale_target(self, rows: slice, cols: slice, screen: pygame.Surface):
+        """Reusable surfaces for scaling one region of the grid image"""
+        key = (rows.start, rows.stop, cols.start, cols.stop)
+        if key == self._scale_key:
+            return self._scale_targets
+
+        if self._scaled is None:
+            self._scaled = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), 0, screen)
+        if self.integer_scale:
+            cell = self.sim.cell_size
+            left, top = cols.start * cell, rows.start * cell
+            right, bottom = cols.stop * cell, rows.stop * cell
+        else:
+            scale_x = WINDOW_WIDTH / self.sim.grid_w
+            scale_y = WINDOW_HEIGHT / self.sim.grid_h
+            left, top = round(cols.start * scale_x), round(rows.start * scale_y)
+            right, bottom = round(cols.stop * scale_x), round(rows.stop * scale_y)
+        right = min(right, WINDOW_WIDTH)
+        bottom = min(bottom, WINDOW_HEIGHT)
+
+        region = pygame.Rect(cols.start, rows.start, cols.stop - cols.start, rows.stop - rows.start)
+        target = (
+            self.surface.subsurface(region),
+            self._scaled.subsurface(pygame.Rect(0, 0, right - left, bottom - top)),
+            (left, top),
+        )
+        self._scale_key = key
+        self._scale_targets = target
+        return target
+
+    def _draw_grid(self, screen: pygame.Surface) -> None:
+        # Only the active region holds water; the rest is a flat fill
+        rows, cols = self.sim.active
+        h = rows.stop - rows.start
+        w = cols.stop - cols.start
+        water = self._water_buf[:h, :w]
+        dye = self._dye_buf[:h, :w]
+        channel = self._channel_buf[:h, :w]
+        tea = self._tea_buf[:h, :w]
+
+        np.multiply(self.sim.water[rows, cols], 1.8, out=water)
+        np.clip(water, 0.0, 1.0, out=water)
+        np.multiply(self.sim.dye[rows, cols], 3.0, out=dye)
+        np.clip(dye, 0.0, 1.0, out=dye)
+
+        # Write each colour channel straight into the surface's pixels
+        pixels = pygame.surfarray.pixels3d(self.surface)
+        for c in range(3):
+            np.multiply(water, WATER_COLOR[c], out=channel)
+            channel += np.multiply(dye, TEA_COLOR[c], out=tea)
+            channel += 15
+            np.minimum(channel, 255, out=channel)
+            np.copyto(pixels[cols, rows, c], channel.T, casting="unsafe")
+        del pixels
+
+        source, scaled, position = self._scale_target(rows, cols, screen)
+        if self.integer_scale:
+            pygame.transform.scale(source, scaled.get_size(), scaled)
+        else:
+            pygame.transform.smoothscale(source, scaled.get_size(), scaled)
+        screen.fill(self.empty_color)
+        screen.blit(scaled, position)
+
+    def draw(self, screen: pygame.Surface, alpha: float = 1.0) -> None:
+        """Draw the simulation, placing particles and leaves `alpha` of the
+        way between the last two simulation steps"""
+        with self.sim.timer("render"):
+            self._draw_grid(screen)
+            self._draw_particles(screen, alpha)
+            self._draw_leaves(screen, alpha)
+            self._draw_cup(screen)
+
+    def _particle_stamp(self, radius: int, level: int) -> pygame.Surface:
+        t = level / (STAMP_COLOR_LEVELS - 1)
+        color = tuple(int(c) for c in WATER_COLOR * (1 - t) + TEA_COLOR * t)
+        size = radius * 2 + 2
+        return self.stamps.get(
+            ("particle", radius, level),
+            lambda stamp: pygame.draw.circle(stamp, color, (radius + 1, radius + 1), radius),
+            (size, size),
+        )
 
-        color = (
-            WATER_COLOR * water_intensity[..., None]
-            + TEA_COLOR * dye_intensity[..., None]
+    def _draw_particles(self, screen: pygame.Surface, alpha: float) -> None:
+        p = self.sim.particles
+        if not p:
+            return
+        px, py = self.sim.interpolated_particles(alpha)
+        x = px.astype(np.intp)
+        y = py.astype(np.intp)
+
+        # tint each particle by the dye in its cell
+        gx = (px * self.sim.inv_cell).astype(np.intp)
+        gy = (py * self.sim.inv_cell).astype(np.intp)
+        inside = (gx >= 0) & (gx < self.sim.grid_w) & (gy >= 0) & (gy < self.sim.grid_h)
+        dye = np.zeros(len(p), dtype=np.float32)
+        dye[inside] = self.sim.dye[gy[inside], gx[inside]]
+        t = np.minimum(1.0, dye * 1.5)
+        levels = np.rint(t * (STAMP_COLOR_LEVELS - 1)).astype(np.intp)
+        radii = p.radius.astype(np.intp)
+
+        # look up each distinct stamp once, then pair every particle with its own
+        keys, which = np.unique(radii * STAMP_COLOR_LEVELS + levels, return_inverse=True)
+        stamps = [
+            self._particle_stamp(int(key) // STAMP_COLOR_LEVELS, int(key) % STAMP_COLOR_LEVELS)
+            for key in keys
+        ]
+        offsets = radii + 1
+        screen.blits(
+            list(zip(
+                [stamps[i] for i in which.tolist()],
+                zip((x - offsets).tolist(), (y - offsets).tolist()),
+            )),
+            False,
         )
-        color = np.clip(color + 15, 0, 255).astype(np.uint8)
 
-        pygame.surfarray.blit_array(self.surface, color.swapaxes(0, 1))
-        scaled = pygame.transform.smoothscale(
-            self.surface, (WINDOW_WIDTH, WINDOW_HEIGHT)
+    def _leaf_stamp(self, length: int, angle_bucket: int, level: int) -> pygame.Surface:
+        t = level / (STAMP_COLOR_LEVELS - 1)
+        color = tuple(
+            int(dry * (1 - t) + wet * t) for dry, wet in zip(LEAF_COLOR_DRY, LEAF_COLOR_WET)
         )
-        screen.blit(scaled, (0, 0))
-
-        for p in self.sim.particles:
-            gx = int(p.x * self.sim.inv_cell)
-            gy = int(p.y * self.sim.inv_cell)
-            if 0 <= gx < self.sim.grid_w and 0 <= gy < self.sim.grid_h:
-                dye = float(self.sim.dye[gy, gx])
-            else:
-                dye = 0.0
-            t = min(1.0, dye * 1.5)
-            color = (
-                int(WATER_COLOR[0] * (1 - t) + TEA_COLOR[0] * t),
-                int(WATER_COLOR[1] * (1 - t) + TEA_COLOR[1] * t),
-                int(WATER_COLOR[2] * (1 - t) + TEA_COLOR[2] * t),
-            )
-            pygame.draw.circle(screen, color, (int(p.x), int(p.y)), int(p.radius))
-
-        for leaf in self.sim.leaves:
-            t = 1.0 - leaf.strength
-            color = (
-                int(LEAF_COLOR_DRY[0] * (1 - t) + LEAF_COLOR_WET[0] * t),
-                int(LEAF_COLOR_DRY[1] * (1 - t) + LEAF_COLOR_WET[1] * t),
-                int(LEAF_COLOR_DRY[2] * (1 - t) + LEAF_COLOR_WET[2] * t),
-            )
-            start, end = leaf.as_segment()
-            pygame.draw.line(
-                screen,
+        angle = angle_bucket * math.pi / LEAF_ANGLE_BUCKETS
+        dx = math.cos(angle) * length * 0.5
+        dy = math.sin(angle) * length * 0.5
+        half = length // 2 + LEAF_THICKNESS
+        center = (half, half)
+        return self.stamps.get(
+            ("leaf", length, angle_bucket, level),
+            lambda stamp: pygame.draw.line(
+                stamp,
                 color,
-                (start[0], start[1]),
-                (end[0], end[1]),
+                (center[0] - dx, center[1] - dy),
+                (center[0] + dx, center[1] + dy),
                 LEAF_THICKNESS,
-            )
+            ),
+            (half * 2, half * 2),
+        )
 
-        self._draw_cup(screen)
+    def _draw_leaves(self, screen: pygame.Surface, alpha: float) -> None:
+        leaves = self.sim.leaves
+        x, y = self.sim.interpolated_leaves(alpha)
+        levels = np.rint((1.0 - leaves.strength) * (STAMP_COLOR_LEVELS - 1)).astype(int)
+        angle_buckets = np.rint(
+            np.mod(leaves.angle, math.pi) / math.pi * LEAF_ANGLE_BUCKETS
+        ).astype(int) % LEAF_ANGLE_BUCKETS
+        lengths = np.rint(leaves.length).astype(int)
+        blits = []
+        for lx, ly, length, angle_bucket, level in zip(
+            x.astype(int).tolist(), y.astype(int).tolist(), lengths.tolist(),
+            angle_buckets.tolist(), levels.tolist(),
+        ):
+            half = length // 2 + LEAF_THICKNESS
+            blits.append((self._leaf_stamp(length, angle_bucket, level), (lx - half, ly - half)))
+        screen.blits(blits, False)
 
     def _draw_cup(self, screen: pygame.Surface) -> None:
         # draw circular cup (wall thickness = CUP_WALL) and visually open the top
@@ -584,25 +769,80 @@ class FluidSimulationScene:
     other scene classes in the project.
     """
 
-    def __init__(self, screen: pygame.Surface):
+    def __init__(
+        self,
+        screen: pygame.Surface,
+        cell_size: int = CELL_SIZE,
+        seed: Optional[int] = None,
+        **sim_options,
+    ):
+        """Create the scene; `sim_options` are passed on to FluidSimulation
+
+        A `seed` makes the whole run, leaf placement included, repeatable.
+        """
         self.screen = screen
         self.width = screen.get_width()
         self.height = screen.get_height()
 
-        self.sim = FluidSimulation(GRID_W, GRID_H)
+        self.rng = random.Random(seed)
+        self._sim_options = sim_options
+        self.sim = self._create_sim(cell_size, **sim_options)
         self.renderer = FluidRenderer(self.sim)
+        self.timestep = FixedTimestep(SIM_DT, MAX_SUBSTEPS)
+        self._place_pour()
 
+        # add a few leaves as background detail
+        for _ in range(50):
+            self.sim.add_leaf(
+                self.rng.uniform(WINDOW_WIDTH * 0.3, WINDOW_WIDTH * 0.7),
+                self.rng.uniform(WINDOW_HEIGHT * 0.5, WINDOW_HEIGHT * 0.9),
+            )
+
+    def _create_sim(self, cell_size: int, **sim_options) -> FluidSimulation:
+        return FluidSimulation(
+            WINDOW_WIDTH // cell_size,
+            WINDOW_HEIGHT // cell_size,
+            cell_size=cell_size,
+            seed=self.rng.getrandbits(32),
+            **sim_options,
+        )
+
+    def _place_pour(self) -> None:
         # precompute pour grid position at the cup rim
         self.pour_gx = int(self.sim.cup_cx * self.sim.inv_cell)
         pour_px = self.sim.cup_cy - self.sim.cup_radius + CUP_WALL + 2
         self.pour_gy = int(pour_px * self.sim.inv_cell)
 
-        # add a few leaves as background detail
-        for _ in range(50):
-            self.sim.add_leaf(
-                random.uniform(WINDOW_WIDTH * 0.3, WINDOW_WIDTH * 0.7),
-                random.uniform(WINDOW_HEIGHT * 0.5, WINDOW_HEIGHT * 0.9),
-            )
+    def set_quality(
+        self,
+        max_particles: Optional[int] = None,
+        cell_size: Optional[int] = None,
+        sim_rate: Optional[float] = None,
+    ) -> None:
+        """Trade simulation detail for speed while running
+
+        A new cell size rebuilds the simulation at that resolution and
+        carries the particles and leaves over; the grid fields are derived
+        from the particles again on the next step. Lowering the particle
+        cap drops the newest particles.
+        """
+        if cell_size is not None and cell_size != self.sim.cell_size:
+            old = self.sim
+            options = dict(self._sim_options, max_particles=old.max_particles)
+            self.sim = self._create_sim(cell_size, **options)
+            p = old.particles
+            self.sim.particles.add(p.x, p.y, p.vx, p.vy, p.radius, p.dye)
+            self.sim.leaves = old.leaves
+            self.sim.timer = old.timer
+            self.sim.tiles = old.tiles
+            self.sim.advector.tiles = old.tiles
+            self.renderer = FluidRenderer(self.sim, self.renderer.integer_scale)
+            self._place_pour()
+        if max_particles is not None:
+            self.sim.max_particles = max_particles
+            self.sim.particles.truncate(max_particles)
+        if sim_rate is not None:
+            self.timestep.step = 1.0 / sim_rate
 
     def handle_event(self, event: pygame.event.Event):
         if event.type == pygame.QUIT:
@@ -614,11 +854,13 @@ class FluidSimulationScene:
         return None
 
     def update(self, dt: float):
-        # continuous pour into the cup
-        self.sim.add_water(self.pour_gx, self.pour_gy, POUR_RATE * dt)
-        self.sim.step(dt)
+        step = self.timestep.step
+        for _ in range(self.timestep.advance(dt)):
+            # continuous pour into the cup
+            self.sim.add_water(self.pour_gx, self.pour_gy, POUR_RATE * step)
+            self.sim.step(step)
         return None
 
     def draw(self) -> None:
         self.screen.fill(BACKGROUND)
-        self.renderer.draw(self.screen)
+        self.renderer.draw(self.screen, self.timestep.alpha)
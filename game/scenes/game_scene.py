@@ -401,7 +401,7 @@ class GameScene:
         border_sprite = self.sprite_loader.get_sprite('border_frame', 'single') if self.sprite_loader else None
         if border_sprite:
             # Center the border frame
-            border_rect = border_sprite.get_rect(center=(self.width // 2, self.height // 2))
+            border_rect = self.sprite_loader.get_sprite_rect('border_frame', 'single', (self.width // 2, self.height // 2))
             self.screen.blit(border_sprite, border_rect)
         else:
             # Fallback: Draw decorative border rectangles
@@ -429,7 +429,7 @@ class GameScene:
         cha_ban_sprite = self.sprite_loader.get_sprite('cha_ban', 'single') if self.sprite_loader else None
         if cha_ban_sprite:
             # Position cha ban sprite
-            cha_ban_rect = cha_ban_sprite.get_rect(center=(150, 380))
+            cha_ban_rect = self.sprite_loader.get_sprite_rect('cha_ban', 'single', (150, 380))
             self.screen.blit(cha_ban_sprite, cha_ban_rect)
         else:
             # Fallback: draw colored rectangle
@@ -1,9 +1,11 @@
 """Loading scene with on-screen messages and asset loading logic."""
 import sys
 import threading
+import time
 import pygame
-from game.sprite_loader import load_all_game_sprites
+from game.sprite_loader import load_all_game_sprites, prefetch_scene_sprites
 
+from game.fluid.governor import QualityGovernor
 from game.scenes.fluid_simulation_scene import FluidSimulationScene
 
 
@@ -17,20 +19,41 @@ class LoadingScene:
         self._lock = threading.Lock()
         self._done = False
         self._error = False
+        # Loader messages and prefetched entities so far, a cheap measure
+        # of loading progress for the quality governor
+        self._progress = 0
+        # Background load of the scenes reachable from the menu
+        self._prefetch = None
 
-        # background fluid simulation scene
+        # background fluid simulation scene, scaled down while it slows loading
         self.sim_scene = FluidSimulationScene(screen)
+        self.governor = QualityGovernor()
+        self.sim_scene.set_quality(**self.governor.quality._asdict())
+
+        self.title_font = pygame.font.Font(None, 48)
+        self.subtitle_font = pygame.font.Font(None, 24)
+        self.message_font = pygame.font.Font(None, 20)
+        self._text_cache = {}
 
     def run(self):
         def add_message(msg: str):
             with self._lock:
                 self._messages.append(msg)
+                self._progress += 1
+
+        def count_prefetched(msg: str):
+            with self._lock:
+                self._progress += 1
 
         add_message("Loading game sprites...")
 
         def loader():
             try:
-                load_all_game_sprites(message_callback=add_message)
+                # Only the menu's sprites block startup; the rest load on demand
+                load_all_game_sprites(message_callback=add_message, parallel=True, scene='menu')
+                # The rest loads in the background; the simulation stays
+                # scaled back while it runs
+                self._prefetch = prefetch_scene_sprites('title', 'game', message_callback=count_prefetched)
             except Exception as e:
                 add_message(f"Error loading sprites: {e}")
                 add_message("Press any key to exit...")
@@ -44,7 +67,7 @@ class LoadingScene:
         t.start()
 
         while True:
-            dt = self.clock.tick(60)
+            dt = self.clock.tick(self.governor.target_fps)
 
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -58,33 +81,49 @@ class LoadingScene:
                         t.join()
                         return
 
-            # draw static simulation background
+            # draw static simulation background; only this work scales with
+            # the quality level, so presenting the frame is not counted
+            started = time.perf_counter()
             self.sim_scene.update(dt / 1000.0)
             self.sim_scene.draw()
+            work_ms = (time.perf_counter() - started) * 1000.0
 
             # draw messages overlay
             with self._lock:
                 msgs = list(self._messages)
+                progress = self._progress
             self._draw_loading_screen(msgs)
 
+            prefetching = self._prefetch is not None and self._prefetch.is_alive()
+            if self._done and not prefetching:
+                self.governor.finish_loading()
+            if self.governor.update(work_ms, dt, progress):
+                self.sim_scene.set_quality(**self.governor.quality._asdict())
+
+    def _render_text(self, font, text, color):
+        """Rendered text surfaces are reused across frames"""
+        key = (id(font), text, color)
+        surface = self._text_cache.get(key)
+        if surface is None:
+            surface = font.render(text, True, color)
+            self._text_cache[key] = surface
+        return surface
+
     def _draw_loading_screen(self, messages):
         # Background
         #self.screen.fill((245, 235, 220, 0.5))
 
         # Title
-        title_font = pygame.font.Font(None, 48)
-        title_text = title_font.render("Teabloom garden", True, (100, 70, 50))
+        title_text = self._render_text(self.title_font, "Teabloom garden", (100, 70, 50))
         title_rect = title_text.get_rect(center=(self.width // 2, 80))
         self.screen.blit(title_text, title_rect)
 
         # Subtitle
-        subtitle_font = pygame.font.Font(None, 24)
-        subtitle_text = subtitle_font.render("Loading game assets...", True, (150, 120, 90))
+        subtitle_text = self._render_text(self.subtitle_font, "Loading game assets...", (150, 120, 90))
         subtitle_rect = subtitle_text.get_rect(center=(self.width // 2, 130))
         self.screen.blit(subtitle_text, subtitle_rect)
 
         # Messages
-        message_font = pygame.font.Font(None, 20)
         start_y = 180
         message_left = 80
         visible_messages = messages[-25:] if len(messages) > 25 else messages
@@ -96,7 +135,7 @@ class LoadingScene:
             if msg.startswith("Press"):
                 color = (200, 100, 0)
 
-            text_surface = message_font.render(msg, True, color)
+            text_surface = self._render_text(self.message_font, msg, color)
             text_rect = text_surface.get_rect(topleft=(message_left, start_y + i * 22))
             self.screen.blit(text_surface, text_rect)
 
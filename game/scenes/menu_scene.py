@@ -45,11 +45,12 @@ class MenuScene:
         # Prefer using the configured logo sprite for the title; fall back to text
         logo = self.sprite_loader.get_sprite('logo', 'single')
         if logo is not None:
-            self.logo_sprite = logo
-            logo_h = logo.get_height()
+            self.has_logo = True
+            # Lay out by the untrimmed logo so spacing matches the artwork
+            logo_h = self.sprite_loader.get_sprite_size('logo', 'single')[1]
             self.title = None
         else:
-            self.logo_sprite = None
+            self.has_logo = False
             # approximate logo height using font size when sprite missing
             logo_h = 72
             self.title = Text("Tea Garden Cats", center_x, 150, font_size=72, 
@@ -149,9 +150,12 @@ class MenuScene:
                         (0, self.height - 50, self.width, 50))
         
         # Draw title (logo if available) and subtitle
-        if getattr(self, 'logo_sprite', None):
-            rect = self.logo_sprite.get_rect(center=(self.width // 2, self.logo_center_y))
-            self.screen.blit(self.logo_sprite, rect)
+        # The logo is looked up each frame rather than held, so the loader
+        # can evict it while other scenes are showing
+        logo = self.sprite_loader.get_sprite('logo', 'single') if getattr(self, 'has_logo', False) else None
+        if logo is not None:
+            rect = self.sprite_loader.get_sprite_rect('logo', 'single', (self.width // 2, self.logo_center_y))
+            self.screen.blit(logo, rect)
         else:
             if getattr(self, 'title', None) is not None:
                 self.title.y = self.logo_center_y
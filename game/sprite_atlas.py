@@ -0,0 +1,170 @@
+"""Texture atlas packing for extracted sprites
+
+Packs many small sprite surfaces into a few large page surfaces so that the
+sprites drawn each frame share memory. Packed sprites are handed out as
+subsurfaces of their page, which keeps every existing `blit` call working.
+"""
+from collections import namedtuple
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+
+# A sprite's location: the surface holding its pixels and the rect within it
+AtlasRegion = namedtuple("AtlasRegion", ["surface", "rect"])
+
+
+class _Skyline:
+    """Bottom-left skyline packer for a single page"""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        # Each segment is [x, y, width] of the current top edge
+        self.segments = [[0, 0, width]]
+
+    def _fit(self, index: int, width: int, height: int) -> Optional[int]:
+        """Return the y a rect starting at segment `index` would rest at"""
+        x = self.segments[index][0]
+        if x + width > self.width:
+            return None
+        y = 0
+        remaining = width
+        i = index
+        while remaining > 0:
+            if i >= len(self.segments):
+                return None
+            seg_x, seg_y, seg_w = self.segments[i]
+            y = max(y, seg_y)
+            if y + height > self.height:
+                return None
+            remaining -= seg_w
+            i += 1
+        return y
+
+    def insert(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """Reserve a width x height rect, returning its top-left or None if full"""
+        best = None
+        for i in range(len(self.segments)):
+            y = self._fit(i, width, height)
+            if y is None:
+                continue
+            score = (y + height, self.segments[i][0])
+            if best is None or score < best[0]:
+                best = (score, i, y)
+        if best is None:
+            return None
+
+        _, index, y = best
+        x = self.segments[index][0]
+        self.segments.insert(index, [x, y + height, width])
+
+        # Trim the segments now covered by the new one
+        i = index + 1
+        while i < len(self.segments):
+            prev_end = self.segments[i - 1][0] + self.segments[i - 1][2]
+            seg = self.segments[i]
+            if seg[0] >= prev_end:
+                break
+            shrink = prev_end - seg[0]
+            seg[0] += shrink
+            seg[2] -= shrink
+            if seg[2] > 0:
+                break
+            del self.segments[i]
+
+        # Merge neighbours at the same height
+        i = 0
+        while i < len(self.segments) - 1:
+            if self.segments[i][1] == self.segments[i + 1][1]:
+                self.segments[i][2] += self.segments[i + 1][2]
+                del self.segments[i + 1]
+            else:
+                i += 1
+        return x, y
+
+
+class SpriteAtlas:
+    """Packs sprite surfaces into shared page surfaces
+
+    Sprites larger than `max_region_size` (full-screen frames, the logo) are
+    drawn rarely and stay standalone so they can be evicted independently.
+    """
+
+    def __init__(self, page_size=(1024, 1024), max_region_size=(256, 256), padding=1):
+        self.page_size = tuple(page_size)
+        self.max_region_size = tuple(max_region_size)
+        self.padding = padding
+        self.pages: List[pygame.Surface] = []
+        self._skylines: List[_Skyline] = []
+        self.regions: Dict[Tuple[str, str], AtlasRegion] = {}
+
+    def accepts(self, surface: pygame.Surface) -> bool:
+        """Whether a surface is small enough to be packed"""
+        return self.accepts_size(*surface.get_size())
+
+    def accepts_size(self, width: int, height: int) -> bool:
+        """Whether a surface of this size would be packed"""
+        return width <= self.max_region_size[0] and height <= self.max_region_size[1]
+
+    def _new_page(self) -> int:
+        page = pygame.Surface(self.page_size, pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            page = page.convert_alpha()
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self._skylines.append(_Skyline(*self.page_size))
+        return len(self.pages) - 1
+
+    def _place(self, width: int, height: int) -> Tuple[int, int, int]:
+        """Find room on an existing page, opening a new one if all are full"""
+        for index, skyline in enumerate(self._skylines):
+            position = skyline.insert(width, height)
+            if position is not None:
+                return index, position[0], position[1]
+        index = self._new_page()
+        position = self._skylines[index].insert(width, height)
+        return index, position[0], position[1]
+
+    def pack(self, items: Iterable[Tuple[Tuple[str, str], pygame.Surface]]) -> Dict[Tuple[str, str], pygame.Surface]:
+        """Copy sprites into the atlas
+
+        Args:
+            items: ((entity_name, variant_name), surface) pairs
+
+        Returns:
+            Mapping of the same keys to the surface to use from now on: a
+            subsurface of an atlas page, or the original if it was too large.
+        """
+        items = list(items)
+        # Tallest first packs a skyline much tighter
+        items.sort(key=lambda item: (item[1].get_height(), item[1].get_width()), reverse=True)
+
+        packed = {}
+        for key, surface in items:
+            if not self.accepts(surface):
+                self.regions[key] = AtlasRegion(surface, surface.get_rect())
+                packed[key] = surface
+                continue
+
+            width, height = surface.get_size()
+            page_index, x, y = self._place(width + self.padding, height + self.padding)
+            page = self.pages[page_index]
+            page.blit(surface, (x, y))
+            rect = pygame.Rect(x, y, width, height)
+            self.regions[key] = AtlasRegion(page, rect)
+            packed[key] = page.subsurface(rect)
+        return packed
+
+    def discard(self, entity_name: str) -> None:
+        """Forget an entity's regions (its page space is not reclaimed)"""
+        for key in [key for key in self.regions if key[0] == entity_name]:
+            del self.regions[key]
+
+    def get_region(self, entity_name: str, variant_name: str) -> Optional[AtlasRegion]:
+        """Look up where a packed sprite lives"""
+        return self.regions.get((entity_name, variant_name))
+
+    def memory_bytes(self) -> int:
+        """Pixel memory held by the atlas pages"""
+        return sum(page.get_width() * page.get_height() * page.get_bytesize() for page in self.pages)
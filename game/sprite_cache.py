@@ -0,0 +1,219 @@
+"""On-disk cache of preprocessed sprites
+
+Stores the final keyed and scaled sprites of every grid sheet as raw RGBA
+blobs in a single file, so later launches skip PNG decoding, background
+keying and scaling. Each entity is keyed by the hash of its grid image and
+the config parameters used to slice it, so edits to either invalidate only
+that entity.
+
+File layout:
+    MAGIC | index length (uint32) | index JSON | raw RGBA data
+"""
+import hashlib
+import json
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import pygame
+
+
+CACHE_MAGIC = b"TBSC"
+# Bump whenever the sprite preprocessing changes so stale blobs are dropped
+CACHE_VERSION = 1
+CACHE_FILENAME = "sprites.cache"
+
+_HEADER = struct.Struct("<4sI")
+
+
+class SpriteCache:
+    """Persistent store of preprocessed sprite surfaces"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.cache_file = self.cache_dir / CACHE_FILENAME
+        self._entries: Dict[str, dict] = {}
+        # Raw RGBA section of the cache file; None once released, after which
+        # blobs are read back from disk on demand
+        self._data = b""
+        self._data_start = 0
+        self._pending: Dict[str, Dict[str, pygame.Surface]] = {}
+        self._loaded = False
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _ensure_loaded(self) -> None:
+        """Read the whole cache file once on first use"""
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            with open(self.cache_file, "rb") as f:
+                blob = f.read()
+            magic, index_len = _HEADER.unpack_from(blob)
+            if magic != CACHE_MAGIC:
+                return
+            index_end = _HEADER.size + index_len
+            index = json.loads(blob[_HEADER.size:index_end].decode("utf-8"))
+            if index.get("version") != CACHE_VERSION:
+                return
+            self._entries = index.get("entities", {})
+            self._data = memoryview(blob)[index_end:]
+            self._data_start = index_end
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"⚠️  Ignoring unreadable sprite cache {self.cache_file}: {e}")
+            self._entries = {}
+            self._data = b""
+
+    def make_key(self, entity_name: str, source_path: Path, params: dict) -> dict:
+        """Build the cache key for an entity from its grid image and load parameters"""
+        stat = source_path.stat()
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(entity_name) or {}
+            source = dict(entry.get("source", {}))
+
+        # Reuse the stored hash if the file is unchanged; hashing happens
+        # outside the lock so concurrent loads do not serialize on it
+        if source.get("size") == stat.st_size and source.get("mtime_ns") == stat.st_mtime_ns:
+            digest = source["sha1"]
+        else:
+            with open(source_path, "rb") as f:
+                digest = hashlib.sha1(f.read()).hexdigest()
+
+        params_json = json.dumps(params, sort_keys=True)
+        key = hashlib.sha1(f"{digest}:{params_json}".encode("utf-8")).hexdigest()
+        return {
+            "key": key,
+            "source": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha1": digest},
+        }
+
+    def get(self, entity_name: str, cache_key: dict) -> Optional[Dict[str, pygame.Surface]]:
+        """Return cached variant surfaces for an entity, or None on a miss"""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._entries.get(entity_name)
+            if not entry or entry.get("key") != cache_key["key"]:
+                return None
+            # Refresh the stat memo if the file was touched without changing
+            if entry.get("source") != cache_key["source"]:
+                entry["source"] = cache_key["source"]
+                self._dirty = True
+            if entity_name in self._pending:
+                return dict(self._pending[entity_name])
+
+            surfaces = {}
+            try:
+                for variant_name, (offset, width, height) in entry["variants"].items():
+                    raw = self._read_blob(offset, width * height * 4)
+                    surface = pygame.image.frombuffer(raw, (width, height), "RGBA")
+                    surfaces[variant_name] = self._to_display_format(surface)
+            except Exception as e:
+                print(f"⚠️  Sprite cache entry for '{entity_name}' is invalid: {e}")
+                return None
+            return surfaces
+
+    def put(self, entity_name: str, cache_key: dict, surfaces: Dict[str, pygame.Surface]) -> None:
+        """Record freshly processed surfaces for an entity"""
+        with self._lock:
+            self._ensure_loaded()
+            self._entries[entity_name] = {
+                "key": cache_key["key"],
+                "source": cache_key["source"],
+                "variants": {},
+            }
+            self._pending[entity_name] = dict(surfaces)
+            self._dirty = True
+
+    def prune(self, keep_names: Iterable[str]) -> None:
+        """Drop entities that are no longer part of the sprite configuration"""
+        keep = set(keep_names)
+        with self._lock:
+            self._ensure_loaded()
+            for name in list(self._entries):
+                if name not in keep:
+                    del self._entries[name]
+                    self._pending.pop(name, None)
+                    self._dirty = True
+
+    def save(self) -> bool:
+        """Write the cache file if anything changed since it was read"""
+        with self._lock:
+            if not self._dirty:
+                return False
+
+            chunks = []
+            entities = {}
+            offset = 0
+            for name, entry in self._entries.items():
+                variants = {}
+                pending = self._pending.get(name)
+                if pending is not None:
+                    items = [
+                        (variant, surface.get_size(), pygame.image.tobytes(surface, "RGBA"))
+                        for variant, surface in pending.items()
+                    ]
+                else:
+                    items = [
+                        (variant, (w, h), self._read_blob(off, w * h * 4))
+                        for variant, (off, w, h) in entry["variants"].items()
+                    ]
+                for variant, (width, height), raw in items:
+                    variants[variant] = [offset, width, height]
+                    chunks.append(raw)
+                    offset += len(raw)
+                entities[name] = {"key": entry["key"], "source": entry["source"], "variants": variants}
+
+            index = json.dumps({"version": CACHE_VERSION, "entities": entities}).encode("utf-8")
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.cache_file.with_suffix(".tmp")
+                with open(tmp_path, "wb") as f:
+                    f.write(_HEADER.pack(CACHE_MAGIC, len(index)))
+                    f.write(index)
+                    for raw in chunks:
+                        f.write(raw)
+                os.replace(tmp_path, self.cache_file)
+            except OSError as e:
+                print(f"⚠️  Could not write sprite cache {self.cache_file}: {e}")
+                return False
+
+            # Serve blobs from the new file from now on
+            self._data = None
+            self._data_start = _HEADER.size + len(index)
+            self._entries = entities
+            self._pending.clear()
+            self._dirty = False
+            return True
+
+    def _read_blob(self, offset: int, size: int):
+        """Get raw bytes from the data section, from memory or from disk"""
+        if self._data is not None:
+            return self._data[offset:offset + size]
+        with open(self.cache_file, "rb") as f:
+            f.seek(self._data_start + offset)
+            raw = f.read(size)
+        if len(raw) != size:
+            raise ValueError("cache file is truncated")
+        return raw
+
+    def release(self) -> None:
+        """Drop the in-memory copy of the cache file
+
+        Later lookups (e.g. reloading an evicted sprite) read just the
+        blobs they need back from disk.
+        """
+        with self._lock:
+            if self._loaded and self._data is not None and len(self._data):
+                self._data = None
+
+    @staticmethod
+    def _to_display_format(surface: pygame.Surface) -> pygame.Surface:
+        """Copy a buffer-backed surface into an owned, blit-friendly surface"""
+        if pygame.display.get_surface() is not None:
+            return surface.convert_alpha()
+        return surface.copy()
@@ -1,14 +1,44 @@
 """Sprite loader for grid-based sprite sheets"""
 import pygame
+import numpy as np
 import os
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from .packaging import resource_path
+from .packaging import resource_path, cache_path
+from .sprite_cache import SpriteCache
+from .sprite_atlas import SpriteAtlas, AtlasRegion
+
+
+# Pixels whose R, G and B channels are all below this value are treated as
+# background and keyed out to full transparency
+DEFAULT_KEY_THRESHOLD = 10
+
+# Memory allowed for standalone (non-atlas) sprites before least recently
+# used entities are evicted; they reload from the sprite cache on next use.
+# The global loader sizes its budget from sprite_manifest.json instead and
+# only falls back to this when the manifest is missing
+DEFAULT_MEMORY_BUDGET = 4 * 1024 * 1024
+# The budget derived from the manifest is the largest scene's standalone
+# sprites times this. Sprites drawn in the current frame are never evicted,
+# so this only needs to absorb a little slack, not other scenes' sprites
+MEMORY_BUDGET_HEADROOM = 1.1
+
+# Rotations are snapped to this many degrees so rotated sprites can be reused,
+# and at most this many flipped/scaled/rotated sprites are kept around
+TRANSFORM_ANGLE_STEP = 5
+TRANSFORM_CACHE_SIZE = 512
+
+# Where a trimmed sprite sat inside its original cell: the untrimmed size and
+# the top-left of the trimmed pixels within it
+SpriteTrim = namedtuple("SpriteTrim", ["source_size", "offset"])
 
 
 class SpriteLoader:
     """Loads and manages sprite sheets from grid images"""
     
-    def __init__(self, assets_dir="assets/images/grids"):
+    def __init__(self, assets_dir="assets/images/grids", cache_dir=None, use_atlas=False, memory_budget=None):
         # Resolve assets directory for development and PyInstaller bundles
         try:
             from .packaging import resource_path
@@ -21,8 +51,38 @@ class SpriteLoader:
             self.assets_dir = Path(assets_dir)
         self.sprites = {}
         self.fallback_surfaces = {}
+        # Optional on-disk cache of preprocessed sprites
+        self.cache = SpriteCache(cache_dir) if cache_dir is not None else None
+        # sprites_config.json entries by name, used to load entities on demand
+        self.config = {}
+        # Scene name -> entity names that scene draws (sprite_manifest.json)
+        self.manifest = {}
+        self._load_lock = threading.Lock()
+        self._loading = {}
+        # Optional texture atlas shared by all small sprites
+        self.atlas = SpriteAtlas() if use_atlas else None
+        self._store_lock = threading.Lock()
+        self._unpacked = set()
+        # Evictable entities in least recently used order -> bytes held;
+        # atlas-packed entities live in shared pages and are never evicted
+        self.memory_budget = memory_budget
+        self._lru = OrderedDict()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        # Frame counter advanced by begin_frame() and the frame each entity
+        # was last drawn in; entities drawn this frame are never evicted
+        self.frame = 0
+        self._last_used = {}
+        # With a headroom the budget follows the manifest (see
+        # manifest_memory_budget) and is refined as entities load;
+        # entity -> bytes it holds outside the atlas once loaded
+        self.budget_headroom = None
+        self._standalone_bytes = {}
+        # (entity, variant, flip_x, angle, scale) -> derived surface, LRU order
+        self._transforms = OrderedDict()
+        # (entity, variant) -> SpriteTrim for sprites cropped to their alpha bounds
+        self.trims = {}
         
-    def load_grid(self, entity_name, variants, grid_cols=None, grid_rows=None, sprite_size=(100, 100), render_size=None, border_offset=(0, 0), grid_offset=(0, 0)):
+    def load_grid(self, entity_name, variants, grid_cols=None, grid_rows=None, sprite_size=(100, 100), render_size=None, border_offset=(0, 0), grid_offset=(0, 0), key_threshold=DEFAULT_KEY_THRESHOLD):
         """
         Load a grid sprite sheet and extract individual sprites
         
@@ -35,6 +95,7 @@ class SpriteLoader:
             render_size: Size of sprite for final rendering (if None, uses sprite_size)
             border_offset: (x, y) offset from the edge of the image before grid starts
             grid_offset: (x, y) spacing between grid cells
+            key_threshold: Channel value below which near-black pixels become transparent
         """
         grid_path = self.assets_dir / f"{entity_name}_grid.png"
         
@@ -44,11 +105,36 @@ class SpriteLoader:
             self._create_fallback_sprites(entity_name, variants, sprite_size, render_size)
             return False
         
+        # Serve already processed sprites from the disk cache when possible
+        cache_key = None
+        if self.cache is not None:
+            try:
+                cache_key = self.cache.make_key(entity_name, grid_path, {
+                    'variants': list(variants),
+                    'grid_cols': grid_cols,
+                    'grid_rows': grid_rows,
+                    'sprite_size': list(sprite_size),
+                    'render_size': list(render_size) if render_size is not None else None,
+                    'border_offset': list(border_offset),
+                    'grid_offset': list(grid_offset),
+                    'key_threshold': key_threshold,
+                })
+                cached = self.cache.get(entity_name, cache_key)
+            except Exception as e:
+                print(f"⚠️  Sprite cache lookup failed for '{entity_name}': {e}")
+                cache_key = cached = None
+            if cached is not None:
+                self._store_variants(entity_name, cached)
+                return True
+        
         try:
             # Load the grid image
             grid_image = pygame.image.load(str(grid_path)).convert_alpha()
             grid_width, grid_height = grid_image.get_size()
             
+            # Key out the black background once for the whole sheet
+            self._remove_black_background(grid_image, key_threshold)
+            
             # Calculate grid dimensions if not provided
             total_variants = len(variants)
             if grid_cols is None:
@@ -63,8 +149,7 @@ class SpriteLoader:
             cell_height = sprite_size[1]
             
             # Extract each sprite
-            if entity_name not in self.sprites:
-                self.sprites[entity_name] = {}
+            loaded = {}
             
             for idx, variant in enumerate(variants):
                 row = idx // grid_cols
@@ -77,17 +162,17 @@ class SpriteLoader:
                 sprite_surface = pygame.Surface((cell_width, cell_height), pygame.SRCALPHA)
                 sprite_surface.blit(grid_image, (0, 0), (x, y, cell_width, cell_height))
                 
-                # Remove black background (replace with transparency)
-                self._remove_black_background(sprite_surface)
-                
                 # Scale to render size if different from extraction size
                 if render_size is not None and render_size != sprite_size:
                     sprite_surface = pygame.transform.smoothscale(sprite_surface, render_size)
                 
                 # Store the sprite (scaled to render size)
                 variant_name = variant.split(":")[0].strip()
-                self.sprites[entity_name][variant_name] = sprite_surface
+                loaded[variant_name] = sprite_surface
             
+            self._store_variants(entity_name, loaded)
+            if cache_key is not None:
+                self.cache.put(entity_name, cache_key, loaded)
             return True
             
         except Exception as e:
@@ -95,21 +180,315 @@ class SpriteLoader:
             self._create_fallback_sprites(entity_name, variants, sprite_size, render_size)
             return False
     
-    def _remove_black_background(self, surface):
-        """Replace pure black (#000000) with transparency"""
-        width, height = surface.get_size()
-        for x in range(width):
-            for y in range(height):
-                color = surface.get_at((x, y))
-                # If pixel is pure black or very close to black, make it transparent
-                if color.r < 10 and color.g < 10 and color.b < 10:
-                    surface.set_at((x, y), (0, 0, 0, 0))
+    def _trim_surface(self, surface):
+        """Crop a sprite to the bounding box of its visible pixels
+        
+        Returns:
+            (trimmed surface, SpriteTrim describing the crop)
+        """
+        bounds = surface.get_bounding_rect()
+        if bounds.size == surface.get_size() or bounds.width == 0 or bounds.height == 0:
+            return surface, SpriteTrim(surface.get_size(), (0, 0))
+        return surface.subsurface(bounds).copy(), SpriteTrim(surface.get_size(), bounds.topleft)
+    
+    def _store_variants(self, entity_name, surfaces):
+        """Publish an entity's variants in one step so readers on other
+        threads never observe a partially loaded entity
+        
+        Fully transparent padding is trimmed off first; the crop is kept in
+        `trims` so sprites still draw at their original position.
+        """
+        trimmed = {}
+        trims = {}
+        for variant_name, surface in surfaces.items():
+            trimmed[variant_name], trims[(entity_name, variant_name)] = self._trim_surface(surface)
+        
+        with self._store_lock:
+            variants = dict(self.sprites.get(entity_name, {}))
+            variants.update(trimmed)
+            self.trims.update(trims)
+            self.sprites[entity_name] = variants
+            self._lru.pop(entity_name, None)
+            self._drop_transforms(entity_name)
+            if self.atlas is not None:
+                # Stale regions must not be served until the entity is repacked
+                self.atlas.discard(entity_name)
+                self._unpacked.add(entity_name)
+            else:
+                self._track(entity_name)
+                self._enforce_budget(keep=entity_name)
+    
+    def _track(self, entity_name):
+        """Register a standalone entity with the LRU, unless it lives in the atlas"""
+        variants = self.sprites.get(entity_name, {})
+        if any(surface.get_parent() is not None for surface in variants.values()):
+            self._measured(entity_name, 0)
+            return
+        self._lru[entity_name] = sum(
+            surface.get_width() * surface.get_height() * surface.get_bytesize()
+            for surface in variants.values()
+        )
+        self._lru.move_to_end(entity_name)
+        self._measured(entity_name, self._lru[entity_name])
+    
+    def _measured(self, entity_name, standalone_bytes):
+        """Record an entity's real standalone size and refine the budget with it"""
+        if self._standalone_bytes.get(entity_name) == standalone_bytes:
+            return
+        self._standalone_bytes[entity_name] = standalone_bytes
+        if self.budget_headroom is not None:
+            self.memory_budget = self.manifest_memory_budget(self.budget_headroom) or DEFAULT_MEMORY_BUDGET
+    
+    def _estimated_standalone_bytes(self, entity_name):
+        """Bytes an entity will hold outside the atlas, measured once it has loaded"""
+        measured = self._standalone_bytes.get(entity_name)
+        if measured is not None:
+            return measured
+        entry = self.config[entity_name]
+        width, height = entry.get('render_size') or entry['sprite_size']
+        if self.atlas is not None and self.atlas.accepts_size(width, height):
+            return 0
+        # Untrimmed, so an estimate errs on the large side
+        return width * height * 4 * len(entry['variants'])
+    
+    def manifest_memory_budget(self, headroom=MEMORY_BUDGET_HEADROOM):
+        """Budget holding the standalone sprites of the manifest's largest scene
+        
+        Atlas-packed sprites live in shared pages outside the budget, so
+        only entities the atlas rejects count, at their trimmed size once
+        loaded and estimated from the config before that.
+        
+        Returns:
+            Budget in bytes, or None if the manifest names no such entities
+        """
+        largest = max(
+            (
+                sum(self._estimated_standalone_bytes(name) for name in set(names) if name in self.config)
+                for names in self.manifest.values()
+            ),
+            default=0,
+        )
+        if largest == 0:
+            return None
+        return int(largest * headroom)
+    
+    def _enforce_budget(self, keep=()):
+        """Evict least recently used entities until within the memory budget"""
+        if self.memory_budget is None:
+            return
+        keep = {keep} if isinstance(keep, str) else set(keep)
+        for entity_name in list(self._lru):
+            if sum(self._lru.values()) <= self.memory_budget:
+                break
+            if entity_name in keep:
+                continue
+            if self.frame and self._last_used.get(entity_name) == self.frame:
+                continue
+            del self._lru[entity_name]
+            for variant_name in self.sprites.pop(entity_name, {}):
+                self.trims.pop((entity_name, variant_name), None)
+            self._drop_transforms(entity_name)
+            self.stats['evictions'] += 1
+    
+    def begin_frame(self):
+        """Start a new frame; call once per frame from the main loop
+        
+        Until the first call every entity is evictable in LRU order.
+        """
+        with self._store_lock:
+            self.frame += 1
+    
+    def _drop_transforms(self, entity_name):
+        """Forget derived surfaces of an entity whose sprites changed or were evicted"""
+        for key in [key for key in self._transforms if key[0] == entity_name]:
+            del self._transforms[key]
+    
+    def get_cache_stats(self):
+        """Get sprite cache counters and memory use
+        
+        Returns:
+            Dict with hits, misses, evictions, bytes held by evictable
+            sprites, the budget and bytes held by atlas pages
+        """
+        with self._store_lock:
+            return {
+                **self.stats,
+                'bytes': sum(self._lru.values()),
+                'budget': self.memory_budget,
+                'atlas_bytes': self.atlas.memory_bytes() if self.atlas is not None else 0,
+            }
+    
+    def pack_atlas(self, keep=()):
+        """Move every loaded but not yet packed sprite into the texture atlas
+        
+        Sprites are replaced by subsurfaces of the atlas pages, so callers of
+        get_sprite keep working while their blits read from shared pages.
+        
+        Args:
+            keep: Entity names that must survive the memory budget check
+        """
+        if self.atlas is None:
+            return
+        with self._store_lock:
+            if not self._unpacked:
+                return
+            items = [
+                ((entity_name, variant_name), surface)
+                for entity_name in self._unpacked
+                for variant_name, surface in self.sprites.get(entity_name, {}).items()
+            ]
+            packed = self.atlas.pack(items)
+            for entity_name in self._unpacked:
+                self.sprites[entity_name] = {
+                    variant_name: packed[(entity_name, variant_name)]
+                    for variant_name in self.sprites.get(entity_name, {})
+                }
+                self._track(entity_name)
+            self._enforce_budget(keep=keep)
+            self._unpacked.clear()
+    
+    def set_config(self, sprite_configs):
+        """Register sprites_config.json entries for on-demand loading"""
+        self.config = {sprite_config['name']: sprite_config for sprite_config in sprite_configs}
+    
+    def ensure_loaded(self, entity_name):
+        """Load an entity from its config entry unless it is already loaded
+        
+        Safe to call from several threads; an entity being loaded elsewhere
+        is waited for instead of being loaded twice.
+        
+        Returns:
+            True if the entity's sprites are available afterwards
+        """
+        if entity_name in self.sprites:
+            return True
+        sprite_config = self.config.get(entity_name)
+        if sprite_config is None:
+            return False
+        
+        with self._load_lock:
+            if entity_name in self.sprites:
+                return True
+            event = self._loading.get(entity_name)
+            owner = event is None
+            if owner:
+                event = self._loading[entity_name] = threading.Event()
+        
+        if not owner:
+            event.wait()
+            return entity_name in self.sprites
+        
+        try:
+            self.load_config_entry(sprite_config)
+        finally:
+            with self._load_lock:
+                del self._loading[entity_name]
+            event.set()
+        return entity_name in self.sprites
+    
+    def load_entities(self, entity_names, message_callback=None, parallel=False, max_workers=None):
+        """Load the named entities, reporting each one as it finishes
+        
+        Args:
+            entity_names: Names of sprites_config.json entries to load
+            message_callback: Optional callback receiving progress messages
+            parallel: Load grid sheets concurrently on a thread pool
+            max_workers: Worker count for parallel loading (defaults to CPU count)
+        """
+        entity_names = [name for name in entity_names if name in self.config]
+        
+        def report(entity_name):
+            msg = f"Loaded {len(self.config[entity_name]['variants'])} sprites for '{entity_name}'"
+            print(msg)
+            if message_callback:
+                message_callback(msg)
+        
+        if parallel and len(entity_names) > 1:
+            # Decode and slice sheets on a worker pool; image decoding and
+            # scaling release the GIL, so sheets are processed concurrently
+            workers = max_workers or min(len(entity_names), os.cpu_count() or 4)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sprite-loader") as executor:
+                futures = {
+                    executor.submit(self.ensure_loaded, entity_name): entity_name
+                    for entity_name in entity_names
+                }
+                # Report sheets in the order they finish
+                for future in as_completed(futures):
+                    future.result()
+                    report(futures[future])
+        else:
+            for entity_name in entity_names:
+                self.ensure_loaded(entity_name)
+                report(entity_name)
+        
+        self.pack_atlas()
+        
+        # Persist newly processed sprites for the next launch
+        if self.cache is not None:
+            self.cache.prune(self.config)
+            self.cache.save()
+            if self.memory_budget is not None:
+                # Evicted sprites reload from disk, so the file need not stay in memory
+                self.cache.release()
+    
+    def prefetch(self, entity_names, message_callback=None):
+        """Warm the named entities on a background thread
+        
+        Args:
+            entity_names: Names of sprites_config.json entries to load
+            message_callback: Optional callback receiving progress messages,
+                called from the background thread
+        
+        Returns:
+            The started daemon thread
+        """
+        names = [name for name in entity_names if name not in self.sprites]
+        
+        def worker():
+            try:
+                self.load_entities(names, message_callback=message_callback, parallel=True)
+            except Exception as e:
+                print(f"Error prefetching sprites: {e}")
+        
+        thread = threading.Thread(target=worker, name="sprite-prefetch", daemon=True)
+        thread.start()
+        return thread
+    
+    def load_config_entry(self, sprite_config):
+        """Load a grid described by one entry of sprites_config.json"""
+        return self.load_grid(
+            sprite_config['name'],
+            sprite_config['variants'],
+            grid_cols=sprite_config['grid_cols'],
+            grid_rows=sprite_config['grid_rows'],
+            sprite_size=tuple(sprite_config['sprite_size']),
+            render_size=tuple(sprite_config.get('render_size', sprite_config['sprite_size'])),
+            border_offset=tuple(sprite_config.get('border_offset', [0, 0])),
+            grid_offset=tuple(sprite_config.get('grid_offset', [0, 0])),
+            key_threshold=sprite_config.get('key_threshold', DEFAULT_KEY_THRESHOLD)
+        )
+    
+    def _remove_black_background(self, surface, threshold=DEFAULT_KEY_THRESHOLD):
+        """Replace near-black pixels with transparency in a single array pass
+        
+        The surface must be 32-bit with per-pixel alpha. Pixels whose R, G
+        and B are all below `threshold` are set to (0, 0, 0, 0).
+        """
+        # Work on the packed pixels in row-major order (surfarray is x-major)
+        pixels = pygame.surfarray.pixels2d(surface).T
+        try:
+            r_mask, g_mask, b_mask, _ = surface.get_masks()
+            r_shift, g_shift, b_shift, _ = surface.get_shifts()
+            background = (pixels & r_mask) < (threshold << r_shift)
+            background &= (pixels & g_mask) < (threshold << g_shift)
+            background &= (pixels & b_mask) < (threshold << b_shift)
+            np.putmask(pixels, background, 0)
+        finally:
+            # Release the pixel view so the surface is unlocked
+            del pixels
     
     def _create_fallback_sprites(self, entity_name, variants, sprite_size, render_size=None):
         """Create simple colored rectangles as fallback"""
-        if entity_name not in self.sprites:
-            self.sprites[entity_name] = {}
-        
         # Use render_size if provided, otherwise use sprite_size
         final_size = render_size if render_size is not None else sprite_size
         fallback_colors = {
@@ -129,6 +508,7 @@ class SpriteLoader:
         # Use render_size if provided, otherwise use sprite_size
         final_size = render_size if render_size is not None else sprite_size
         
+        fallbacks = {}
         for variant in variants:
             variant_name = variant.split(":")[0].strip()
             surface = pygame.Surface(final_size, pygame.SRCALPHA)
@@ -145,16 +525,165 @@ class SpriteLoader:
                                (10, 10, final_size[0]-20, final_size[1]-20),
                                border_radius=5)
             
-            self.sprites[entity_name][variant_name] = surface
+            fallbacks[variant_name] = surface
+        
+        self._store_variants(entity_name, fallbacks)
+    
+    def get_sprite(self, entity_name, variant_name, flip_x=False, angle=0, scale=1):
+        """Get a specific sprite, loading its entity on first request
+        
+        Entities evicted to stay within the memory budget are reloaded
+        transparently from the sprite cache.
+        
+        Args:
+            entity_name: Name of the entity
+            variant_name: Name of the variant
+            flip_x: Mirror the sprite horizontally
+            angle: Counter-clockwise rotation in degrees, snapped to
+                TRANSFORM_ANGLE_STEP
+            scale: Size multiplier
+        
+        Transformed sprites are memoized and shared between callers, so
+        they must not be drawn on. Setting their alpha right before a blit
+        is fine.
+        """
+        sprite = self._get_base_sprite(entity_name, variant_name)
+        return self._transform(entity_name, variant_name, sprite, flip_x, angle, scale)
+    
+    def _transform(self, entity_name, variant_name, sprite, flip_x, angle, scale):
+        """Flipped, scaled and rotated version of a base sprite, memoized"""
+        angle = quantize_angle(angle)
+        if sprite is None or (not flip_x and not angle and scale == 1):
+            return sprite
+        
+        key = (entity_name, variant_name, bool(flip_x), angle, scale)
+        with self._store_lock:
+            derived = self._transforms.get(key)
+            if derived is not None:
+                self._transforms.move_to_end(key)
+                return derived
+        
+        derived = sprite
+        if flip_x:
+            derived = pygame.transform.flip(derived, True, False)
+        if scale != 1:
+            size = (max(1, round(sprite.get_width() * scale)), max(1, round(sprite.get_height() * scale)))
+            derived = pygame.transform.smoothscale(derived, size)
+        if angle:
+            derived = pygame.transform.rotate(derived, angle)
+        
+        with self._store_lock:
+            self._transforms[key] = derived
+            while len(self._transforms) > TRANSFORM_CACHE_SIZE:
+                self._transforms.popitem(last=False)
+        return derived
     
-    def get_sprite(self, entity_name, variant_name):
-        """Get a specific sprite"""
-        if entity_name in self.sprites and variant_name in self.sprites[entity_name]:
-            return self.sprites[entity_name][variant_name]
+    def _get_base_sprite(self, entity_name, variant_name):
+        """Get an untransformed sprite, counting cache hits and misses"""
+        variants = self.sprites.get(entity_name)
+        with self._store_lock:
+            self._last_used[entity_name] = self.frame
+            if variants is not None:
+                self.stats['hits'] += 1
+                if entity_name in self._lru:
+                    self._lru.move_to_end(entity_name)
+            else:
+                self.stats['misses'] += 1
+        if variants is None:
+            if self.ensure_loaded(entity_name):
+                self.pack_atlas(keep=entity_name)
+                variants = self.sprites.get(entity_name)
+        if variants is not None:
+            return variants.get(variant_name)
         return None
     
+    def _peek_sprite(self, entity_name, variant_name):
+        """Get an already loaded base sprite without counting a cache lookup
+        
+        For helpers working on a sprite their caller fetched for the same
+        draw; falls back to a counted lookup (and load) if it is missing.
+        """
+        variants = self.sprites.get(entity_name)
+        if variants is None:
+            return self._get_base_sprite(entity_name, variant_name)
+        return variants.get(variant_name)
+    
+    def get_sprite_size(self, entity_name, variant_name):
+        """Get a sprite's size before trimming, for layout purposes"""
+        sprite = self.get_sprite(entity_name, variant_name)
+        if sprite is None:
+            return None
+        trim = self.trims.get((entity_name, variant_name))
+        return trim.source_size if trim is not None else sprite.get_size()
+    
+    def get_sprite_rect(self, entity_name, variant_name, center, surface=None, angle=0, flip_x=False, scale=1):
+        """Get the rect to blit a sprite at so its original cell is centered on `center`
+        
+        Args:
+            entity_name: Name of the entity
+            variant_name: Name of the variant
+            center: (x, y) where the untrimmed sprite's center should land
+            surface: Surface actually blitted, if transformed outside the
+                loader (defaults to get_sprite with the same transform)
+            angle: Counter-clockwise rotation in degrees applied to `surface`
+            flip_x: Whether `surface` was mirrored horizontally
+            scale: Size multiplier applied to `surface`
+        """
+        # The caller already fetched this sprite to blit it, so these lookups
+        # do not count as hits again
+        sprite = self._peek_sprite(entity_name, variant_name)
+        if surface is None:
+            angle = quantize_angle(angle)
+            surface = self._transform(entity_name, variant_name, sprite, flip_x, angle, scale)
+        trim = self.trims.get((entity_name, variant_name))
+        if trim is None:
+            return surface.get_rect(center=center)
+        
+        (source_w, source_h), (trim_x, trim_y) = trim
+        trim_w, trim_h = sprite.get_size()
+        if flip_x:
+            trim_x = source_w - trim_x - trim_w
+        
+        if not angle and scale == 1:
+            # Center the untrimmed cell exactly like get_rect(center=...)
+            # would, so fractional centers round the same way
+            cell = pygame.Rect(0, 0, source_w, source_h)
+            cell.center = center
+            return pygame.Rect(cell.left + trim_x, cell.top + trim_y, *surface.get_size())
+        
+        # Rotate the trimmed center's offset from the cell center with the sprite
+        offset = pygame.math.Vector2(trim_x + trim_w / 2 - source_w / 2, trim_y + trim_h / 2 - source_h / 2)
+        offset = offset.rotate(-angle) * scale
+        return surface.get_rect(center=(center[0] + offset.x, center[1] + offset.y))
+    
+    def get_untrimmed_sprite(self, entity_name, variant_name):
+        """Get a copy of a sprite restored onto its original transparent cell"""
+        sprite = self.get_sprite(entity_name, variant_name)
+        trim = self.trims.get((entity_name, variant_name))
+        if sprite is None or trim is None:
+            return sprite
+        canvas = pygame.Surface(trim.source_size, pygame.SRCALPHA)
+        canvas.blit(sprite, trim.offset)
+        return canvas
+    
+    def get_region(self, entity_name, variant_name):
+        """Get where a sprite's pixels live as an AtlasRegion(surface, rect)
+        
+        Packed sprites point into a shared atlas page; sprites too large to
+        pack (or loaded without an atlas) cover their whole own surface.
+        """
+        sprite = self.get_sprite(entity_name, variant_name)
+        if sprite is None:
+            return None
+        if self.atlas is not None:
+            region = self.atlas.get_region(entity_name, variant_name)
+            if region is not None:
+                return region
+        return AtlasRegion(sprite, sprite.get_rect())
+    
     def has_sprite(self, entity_name, variant_name=None):
         """Check if a sprite exists"""
+        self.ensure_loaded(entity_name)
         if variant_name is None:
             return entity_name in self.sprites
         return entity_name in self.sprites and variant_name in self.sprites[entity_name]
@@ -162,54 +691,93 @@ class SpriteLoader:
 
 # Global sprite loader instance
 _sprite_loader = None
+_sprite_loader_lock = threading.Lock()
+
+
+def quantize_angle(angle):
+    """Snap a rotation in degrees to the nearest TRANSFORM_ANGLE_STEP, in [0, 360)"""
+    return round(angle / TRANSFORM_ANGLE_STEP) * TRANSFORM_ANGLE_STEP % 360
 
-def get_sprite_loader():
-    """Get the global sprite loader instance"""
+
+def _read_sprite_config():
+    """Read the list of grid entries from sprites_config.json"""
+    import json
+    
+    config_path = Path(resource_path("data/sprites_config.json"))
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
+
+def _read_sprite_manifest():
+    """Read the per-scene prefetch manifest, or an empty one if missing"""
+    import json
+    
+    manifest_path = Path(resource_path("data/sprite_manifest.json"))
+    try:
+        with open(manifest_path, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"⚠️  Could not read sprite manifest {manifest_path}: {e}")
+        return {}
+
+
+def get_sprite_loader(memory_budget=None):
+    """Get the global sprite loader instance
+    
+    Args:
+        memory_budget: Bytes of standalone sprites to keep when the loader is
+            first created; by default derived from sprite_manifest.json
+            (see SpriteLoader.manifest_memory_budget). Ignored once the
+            loader exists.
+    """
     global _sprite_loader
-    if _sprite_loader is None:
-        _sprite_loader = SpriteLoader(resource_path("assets/images/grids"))
+    with _sprite_loader_lock:
+        if _sprite_loader is None:
+            loader = SpriteLoader(resource_path("assets/images/grids"), cache_dir=cache_path("sprites"),
+                                  use_atlas=True, memory_budget=memory_budget)
+            try:
+                loader.set_config(_read_sprite_config())
+            except Exception as e:
+                print(f"⚠️  Sprites will not load on demand: {e}")
+            loader.manifest = _read_sprite_manifest()
+            if memory_budget is None:
+                loader.memory_budget = loader.manifest_memory_budget() or DEFAULT_MEMORY_BUDGET
+                loader.budget_headroom = MEMORY_BUDGET_HEADROOM
+            _sprite_loader = loader
     return _sprite_loader
 
 
-def load_all_game_sprites(message_callback=None):
+def load_all_game_sprites(message_callback=None, parallel=False, max_workers=None, scene=None):
     """Load all sprites needed for the game from sprites_config.json
     
     Args:
         message_callback: Optional callback function to receive progress messages
+        parallel: Load grid sheets concurrently on a thread pool
+        max_workers: Worker count for parallel loading (defaults to CPU count)
+        scene: Only load what this scene needs according to sprite_manifest.json;
+            everything else is loaded on first use or by prefetch_scene_sprites
     """
-    import json
-    from pathlib import Path
-    
     loader = get_sprite_loader()
     
     # Load sprite configuration
-    config_path = Path(resource_path("data/sprites_config.json"))
     try:
-        with open(config_path, 'r') as f:
-            sprites = json.load(f)
+        sprites = _read_sprite_config()
     except FileNotFoundError:
+        config_path = Path(resource_path("data/sprites_config.json"))
         error_msg = f"❌ Error: Configuration file not found: {config_path}"
         print(error_msg)
         if message_callback:
             message_callback(error_msg)
         return loader
+    loader.set_config(sprites)
     
-    # Load all sprites from configuration
-    for sprite_config in sprites:
-        loader.load_grid(
-            sprite_config['name'],
-            sprite_config['variants'],
-            grid_cols=sprite_config['grid_cols'],
-            grid_rows=sprite_config['grid_rows'],
-            sprite_size=tuple(sprite_config['sprite_size']),
-            render_size=tuple(sprite_config.get('render_size', sprite_config['sprite_size'])),
-            border_offset=tuple(sprite_config.get('border_offset', [0, 0])),
-            grid_offset=tuple(sprite_config.get('grid_offset', [0, 0]))
-        )
-        msg = f"Loaded {len(sprite_config['variants'])} sprites for '{sprite_config['name']}'"
-        print(msg)
-        if message_callback:
-            message_callback(msg)
+    names = [sprite_config['name'] for sprite_config in sprites]
+    if scene is not None and scene in loader.manifest:
+        names = [name for name in loader.manifest[scene] if name in loader.config]
+    
+    loader.load_entities(names, message_callback=message_callback, parallel=parallel, max_workers=max_workers)
     
     success_msg = "All sprite loading complete!"
     print(f"\n{success_msg}")
@@ -218,3 +786,22 @@ def load_all_game_sprites(message_callback=None):
         message_callback(success_msg)
     
     return loader
+
+
+def prefetch_scene_sprites(*scene_names, message_callback=None):
+    """Warm the sprites of upcoming scenes in the background
+    
+    Args:
+        scene_names: Scene keys from sprite_manifest.json (e.g. 'game', 'title')
+        message_callback: Optional callback receiving progress messages
+    
+    Returns:
+        The background thread doing the work
+    """
+    loader = get_sprite_loader()
+    names = []
+    for scene_name in scene_names:
+        for name in loader.manifest.get(scene_name, []):
+            if name not in names:
+                names.append(name)
+    return loader.prefetch(names, message_callback=message_callback)
@@ -128,14 +128,13 @@ class CatVisitor:
             frame = 1 + int(self.animation_timer / self.move_frame_duration) % 2
             sprite_variant = f"moving{frame}"
 
-        sprite = self.sprite_loader.get_sprite(cat_id, sprite_variant) if self.sprite_loader else None
+        # Mirror sprite when arriving
+        flip_x = self.state == "arriving"
+        sprite = self.sprite_loader.get_sprite(cat_id, sprite_variant, flip_x=flip_x) if self.sprite_loader else None
         
         if sprite:
             # Draw sprite centered
-            sprite_rect = sprite.get_rect(center=(x, y))
-            if self.state == "arriving":
-                # mirror sprite when arriving
-                sprite = pygame.transform.flip(sprite, True, False)
+            sprite_rect = self.sprite_loader.get_sprite_rect(cat_id, sprite_variant, (x, y), flip_x=flip_x)
             screen.blit(sprite, sprite_rect)
         else:
             # Fallback rendering
@@ -41,7 +41,7 @@ class ChaHai:
         sprite = self.sprite_loader.get_sprite('chahai', sprite_variant) if self.sprite_loader else None
         
         if sprite:
-            sprite_rect = sprite.get_rect(center=(x, y))
+            sprite_rect = self.sprite_loader.get_sprite_rect('chahai', sprite_variant, (x, y))
             screen.blit(sprite, sprite_rect)
             
             # Label when filled
@@ -48,7 +48,7 @@ class HotWaterKettle:
         sprite = self.sprite_loader.get_sprite('kettle', sprite_variant) if self.sprite_loader else None
         
         if sprite:
-            sprite_rect = sprite.get_rect(center=(x, y))
+            sprite_rect = self.sprite_loader.get_sprite_rect('kettle', sprite_variant, (x, y))
             screen.blit(sprite, sprite_rect)
             
             # Draw steam above sprite
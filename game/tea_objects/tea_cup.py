@@ -32,7 +32,7 @@ class TeaCup:
         sprite = self.sprite_loader.get_sprite('teacup', sprite_variant) if self.sprite_loader else None
         
         if sprite:
-            sprite_rect = sprite.get_rect(center=(x, y))
+            sprite_rect = self.sprite_loader.get_sprite_rect('teacup', sprite_variant, (x, y))
             screen.blit(sprite, sprite_rect)
         else:
             # Fallback rendering
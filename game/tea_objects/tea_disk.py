@@ -22,7 +22,7 @@ class TeaDisk:
         
         if sprite:
             # Draw sprite centered
-            sprite_rect = sprite.get_rect(center=(x, y))
+            sprite_rect = self.sprite_loader.get_sprite_rect('tea_disks', tea_id, (x, y))
             screen.blit(sprite, sprite_rect)
         else:
             # Fallback to colored circle
@@ -58,7 +58,7 @@ class TeaDisk:
         if not self.game_state.is_tea_unlocked(self.tea_data['id']):
             lock_sprite = self.sprite_loader.get_sprite('lock_icon', 'single') if self.sprite_loader else None
             if lock_sprite:
-                lock_rect = lock_sprite.get_rect(center=(x, y))
+                lock_rect = self.sprite_loader.get_sprite_rect('lock_icon', 'single', (x, y))
                 screen.blit(lock_sprite, lock_rect)
             else:
                 s = pygame.Surface((self.radius*2, self.radius*2), pygame.SRCALPHA)
@@ -66,7 +66,7 @@ class TeaGod:
         sprite = self.sprite_loader.get_sprite('tea_god', sprite_variant) if self.sprite_loader else None
         
         if sprite:
-            sprite_rect = sprite.get_rect(center=(x, y))
+            sprite_rect = self.sprite_loader.get_sprite_rect('tea_god', sprite_variant, (x, y))
             screen.blit(sprite, sprite_rect)
         else:
             # Fallback rendering
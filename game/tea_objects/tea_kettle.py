@@ -129,11 +129,12 @@ class TeaKettle:
         if sprite:
             # Apply rotation if pouring
             if self.is_pouring and self.pour_rotation > 0:
-                rotated_sprite = pygame.transform.rotate(sprite, -self.pour_rotation)
-                sprite_rect = rotated_sprite.get_rect(center=(x, y))
+                rotated_sprite = self.sprite_loader.get_sprite('gaiwan', sprite_variant, angle=-self.pour_rotation)
+                sprite_rect = self.sprite_loader.get_sprite_rect('gaiwan', sprite_variant, (x, y),
+                                                                 angle=-self.pour_rotation)
                 screen.blit(rotated_sprite, sprite_rect)
             else:
-                sprite_rect = sprite.get_rect(center=(x, y))
+                sprite_rect = self.sprite_loader.get_sprite_rect('gaiwan', sprite_variant, (x, y))
                 screen.blit(sprite, sprite_rect)
         else:
             # Fallback to colored shapes
@@ -26,7 +26,7 @@ class Particle:
         if sprite:
             sprite_with_alpha = sprite.copy()
             sprite_with_alpha.set_alpha(self.alpha)
-            sprite_rect = sprite_with_alpha.get_rect(center=(self.x, self.y))
+            sprite_rect = sprite_loader.get_sprite_rect(sprite_name, self.variant, (self.x, self.y))
             screen.blit(sprite_with_alpha, sprite_rect)
 
 
@@ -73,7 +73,7 @@ class ExplosionParticle:
             if sprite:
                 sprite_with_alpha = sprite.copy()
                 sprite_with_alpha.set_alpha(self.alpha)
-                rect = sprite_with_alpha.get_rect(center=(int(self.x), int(self.y)))
+                rect = sprite_loader.get_sprite_rect(sprite_name, self.variant, (int(self.x), int(self.y)))
                 screen.blit(sprite_with_alpha, rect)
                 return
 
@@ -1,6 +1,5 @@
 """Petal particle for falling cherry blossom effect"""
 import random
-import pygame
 from .particle_system import Particle
 
 
@@ -89,12 +88,12 @@ class PetalParticle(Particle):
             sprite_loader: Sprite loader instance
             sprite_name: Name of sprite to load
         """
-        sprite = sprite_loader.get_sprite(sprite_name, self.variant) if sprite_loader else None
-        if sprite:
-            # Rotate and apply alpha
-            rotated_sprite = pygame.transform.rotate(sprite, self.rotation)
+        # Rotated sprites are shared, so alpha is set right before each blit
+        rotated_sprite = sprite_loader.get_sprite(sprite_name, self.variant, angle=self.rotation) if sprite_loader else None
+        if rotated_sprite:
             rotated_sprite.set_alpha(self.alpha)
-            sprite_rect = rotated_sprite.get_rect(center=(self.x, self.y))
+            sprite_rect = sprite_loader.get_sprite_rect(sprite_name, self.variant, (self.x, self.y),
+                                                        angle=self.rotation)
             screen.blit(rotated_sprite, sprite_rect)
 
 
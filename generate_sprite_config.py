@@ -149,6 +149,11 @@ def analyze_grid_image(image_path, entity_name, existing_config=None):
                     # Keep original size
                     render_size = [sprite_width, sprite_height]
             
+            # Preserve a hand-tuned background key threshold
+            key_threshold = 10
+            if existing_config and 'key_threshold' in existing_config:
+                key_threshold = existing_config['key_threshold']
+            
             config = {
                 "name": entity_name,
                 "variants": variant_names,
@@ -157,7 +162,8 @@ def analyze_grid_image(image_path, entity_name, existing_config=None):
                 "sprite_size": [sprite_width, sprite_height],
                 "render_size": render_size,
                 "border_offset": border_offset,
-                "grid_offset": grid_offset
+                "grid_offset": grid_offset,
+                "key_threshold": key_threshold
             }
             
             offset_info = ""
@@ -8,6 +8,7 @@ from game.scenes.stats_scene import StatsScene
 from game.scenes.loading_scene import LoadingScene
 from game.scenes.title_scene import TitleScene
 from game.sound_manager import get_sound_manager, SoundEffect
+from game.sprite_loader import get_sprite_loader
 
 
 class Game:
@@ -58,6 +59,8 @@ class Game:
     def _load_sprites_with_screen(self):
         """Delegate loading with on-screen feedback to LoadingScene."""
         loader = LoadingScene(self.screen)
+        # Also starts warming the scenes reachable from the menu, which
+        # carries on in the background while the player is in it
         loader.run()
     
     # loading display logic moved to `game.scenes.loading_scene.LoadingScene`
@@ -105,7 +108,8 @@ class Game:
                         elif result == 'stats':
                             self.scenes['stats'] = StatsScene(self.screen, self.game_state)
             
-            # Draw scene
+            # Draw scene; sprites it draws are safe from eviction this frame
+            get_sprite_loader().begin_frame()
             scene.draw()
             
             # Update display
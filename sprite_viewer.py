@@ -102,16 +102,7 @@ class SpriteViewer:
                 del self.sprite_loader.sprites[sprite_name]
             
             # Reload this sprite
-            self.sprite_loader.load_grid(
-                sprite_config['name'],
-                sprite_config['variants'],
-                grid_cols=sprite_config['grid_cols'],
-                grid_rows=sprite_config['grid_rows'],
-                sprite_size=tuple(sprite_config['sprite_size']),
-                render_size=tuple(sprite_config.get('render_size', sprite_config['sprite_size'])),
-                border_offset=tuple(sprite_config.get('border_offset', [0, 0])),
-                grid_offset=tuple(sprite_config.get('grid_offset', [0, 0]))
-            )
+            self.sprite_loader.load_config_entry(sprite_config)
             print(f"✓ Reloaded {len(sprite_config['variants'])} sprites for '{sprite_config['name']}'")
         
         # Clear modified tracking
@@ -387,7 +378,7 @@ class SpriteViewer:
         # Draw loaded sprite variants
         x_offset = 240
         for variant in sprite_config['variants'][:10]:  # Show max 10 variants
-            sprite = self.sprite_loader.get_sprite(sprite_config['name'], variant)
+            sprite = self.sprite_loader.get_untrimmed_sprite(sprite_config['name'], variant)
             if sprite:
                 # Scale sprite to fit
                 max_size = 60
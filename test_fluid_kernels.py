@@ -0,0 +1,313 @@
+"""Parity check for the fluid simulation kernel backends
+
+Run with: uv run test_fluid_kernels.py (or pytest test_fluid_kernels.py)
+Every available backend must match the pure-Python reference on randomly
+packed water particles, packed leaves must come apart inside the cup, and
+a recorded simulation run must replay identically.
+"""
+import numpy as np
+
+from game.fluid.advection import ADVECTION_METHODS, Advector
+from game.fluid.kernels import available_backends, get_kernels
+from game.fluid.leaves import LeafArrays, closest_points, confine_to_circle, resolve_segment_contacts
+from game.fluid.parallel import TileExecutor
+from game.fluid.pressure import PressureSolver, face_divergence
+from game.fluid.replay import InputScript, compare, replay
+from game.fluid.spatial_hash import SpatialHash
+from game.fluid.transfer import gather
+from game.scenes.fluid_simulation_scene import SIM_DT, FluidSimulation
+
+
+TOLERANCE = 1e-3
+# Replays splat with the bilinear kernel: with "nearest" a rounding-level
+# move can carry a particle into the next cell and change the grid
+# velocity the particles read back. The pressure solve is the same NumPy
+# code for every backend and only magnifies the differences, so it is off.
+REPLAY_OPTIONS = {"splat_kernel": "cic", "pressure_solver": None}
+
+
+def _random_discs(seed, count, radius, spread):
+    rng = np.random.default_rng(seed)
+    r = np.sqrt(rng.random(count)) * spread
+    a = rng.random(count) * 2 * np.pi
+    return {
+        "x": (512 + r * np.cos(a)).astype(np.float32),
+        "y": (478 + r * np.sin(a)).astype(np.float32),
+        "vx": rng.uniform(-30, 30, count).astype(np.float32),
+        "vy": rng.uniform(-30, 30, count).astype(np.float32),
+        "radius": np.full(count, radius, dtype=np.float32),
+    }
+
+
+def _tiled():
+    # Forced parallel with several workers so tiling is exercised on any machine
+    return TileExecutor(workers=3, mode="parallel")
+
+
+def _run(backend, discs, cell_size, restitution, tiles=None):
+    arrays = {name: values.copy() for name, values in discs.items()}
+    grid = SpatialHash(1024, 768, cell_size)
+    grid.build(arrays["x"], arrays["y"])
+    contacts = get_kernels(backend).resolve_contacts(
+        arrays["x"], arrays["y"], arrays["vx"], arrays["vy"], arrays["radius"],
+        grid, restitution, tiles=tiles,
+    )
+    return arrays, np.asarray(contacts)
+
+
+def _check_parity(discs, cell_size, restitution):
+    reference, reference_contacts = _run("python", discs, cell_size, restitution)
+    assert reference_contacts.sum() > 0, "test setup produced no contacts"
+    for backend in available_backends():
+        for tiles in (None, _tiled()):
+            label = f"{backend}{' tiled' if tiles else ''}"
+            result, contacts = _run(backend, discs, cell_size, restitution, tiles)
+            assert np.array_equal(contacts, reference_contacts), f"{label}: contact counts differ"
+            for name in ("x", "y", "vx", "vy"):
+                error = float(np.abs(result[name] - reference[name]).max())
+                assert error < TOLERANCE, f"{label}: {name} differs by {error}"
+
+
+def test_particle_contacts_match_reference():
+    discs = _random_discs(seed=1, count=600, radius=4, spread=150)
+    _check_parity(discs, cell_size=8, restitution=0.65)
+
+
+def test_packed_leaves_settle_in_cup():
+    # Leaves dropped on top of each other in a round cup, resolved the way
+    # the simulation does every step
+    rng = np.random.default_rng(2)
+    count = 80
+    r = np.sqrt(rng.random(count)) * 90
+    a = rng.random(count) * 2 * np.pi
+    leaves = LeafArrays()
+    leaves.add(512 + r * np.cos(a), 478 + r * np.sin(a), rng.uniform(0, np.pi, count),
+               rng.uniform(14, 24, count))
+    leaves.vx[:] = rng.uniform(-2, 2, count)
+    leaves.vy[:] = rng.uniform(-2, 2, count)
+    assert _segment_gaps(leaves).min() < 1.0, "test setup produced no overlaps"
+
+    grid = SpatialHash(1024, 768, 24 + 5)
+    for _ in range(40):
+        grid.build(leaves.x, leaves.y)
+        resolve_segment_contacts(leaves, grid, 5.0, 0.0, 0.85)
+        confine_to_circle(leaves, 512.0, 478.0, 100.0, 0.85)
+    gap = _segment_gaps(leaves).min()
+    assert gap > 4.0, f"leaves still overlap by {5.0 - gap}"
+    ax, ay, bx, by = leaves.endpoints()
+    reach = np.hypot(np.concatenate((ax, bx)) - 512.0, np.concatenate((ay, by)) - 478.0)
+    assert reach.max() <= 100.0 + 1e-3, f"leaf end {reach.max()} outside the cup"
+
+
+def test_spatial_hash_radius_query():
+    discs = _random_discs(seed=3, count=500, radius=4, spread=200)
+    grid = SpatialHash(1024, 768, 8)
+    grid.build(discs["x"], discs["y"])
+    qx = np.array([512.0, 430.0, 600.0], dtype=np.float32)
+    qy = np.array([478.0, 500.0, 380.0], dtype=np.float32)
+    q, p = grid.query_radius(qx, qy, 20.0)
+    found = set(zip(q.tolist(), p.tolist()))
+    dist2 = (discs["x"][None, :] - qx[:, None]) ** 2 + (discs["y"][None, :] - qy[:, None]) ** 2
+    expected = set(zip(*np.nonzero(dist2 <= 400.0)))
+    assert found == {(int(a), int(b)) for a, b in expected}
+
+
+def _reference_advect(src, u, v, scale):
+    h, w = src.shape
+    dst = np.zeros_like(src)
+    for y in range(h):
+        for x in range(w):
+            bx = min(max(x - float(u[y, x]) * scale, 0.0), w - 1.001)
+            by = min(max(y - float(v[y, x]) * scale, 0.0), h - 1.001)
+            x0 = int(bx)
+            y0 = int(by)
+            sx = bx - x0
+            sy = by - y0
+            dst[y, x] = (
+                (src[y0, x0] * (1 - sx) + src[y0, x0 + 1] * sx) * (1 - sy)
+                + (src[y0 + 1, x0] * (1 - sx) + src[y0 + 1, x0 + 1] * sx) * sy
+            )
+    return dst
+
+
+def test_advection_matches_reference():
+    rng = np.random.default_rng(4)
+    shape = (40, 56)
+    fields = [rng.random(shape).astype(np.float32) for _ in range(2)]
+    u = rng.uniform(-600, 600, shape).astype(np.float32)
+    v = rng.uniform(-600, 600, shape).astype(np.float32)
+    scale = (1 / 60) / 6
+
+    advector = Advector("semi-lagrangian")
+    advector.prepare(u, v, scale)
+    for src in fields:
+        result = np.zeros_like(src)
+        advector.advect(src, result)
+        error = float(np.abs(result - _reference_advect(src, u, v, scale)).max())
+        assert error < 1e-5, f"advection differs by {error}"
+
+
+def test_maccormack_keeps_detail():
+    # A bump carried right across the grid at a constant speed
+    shape = (24, 64)
+    u = np.full(shape, 0.37, dtype=np.float32)
+    v = np.zeros(shape, dtype=np.float32)
+    x = np.arange(shape[1], dtype=np.float32)
+    bump = np.tile(np.exp(-((x - 12.0) / 3.0) ** 2), (shape[0], 1)).astype(np.float32)
+
+    peaks = {}
+    for method in ADVECTION_METHODS:
+        advector = Advector(method)
+        advector.prepare(u, v, 1.0)
+        field = bump.copy()
+        constant = np.full(shape, 0.25, dtype=np.float32)
+        for _ in range(60):
+            advector.advect(field, field)
+            advector.advect(constant, constant)
+        assert field.min() >= 0.0 and field.max() <= 1.0, f"{method}: new extremes"
+        assert np.allclose(constant, 0.25), f"{method}: constant field changed"
+        peaks[method] = float(field.max())
+    assert peaks["maccormack"] > peaks["semi-lagrangian"] + 0.1, f"peaks {peaks}"
+
+
+def test_tiled_advection_matches_serial():
+    rng = np.random.default_rng(9)
+    shape = (37, 50)
+    u = rng.uniform(-600, 600, shape).astype(np.float32)
+    v = rng.uniform(-600, 600, shape).astype(np.float32)
+    src = rng.random(shape).astype(np.float32)
+    for method in ADVECTION_METHODS:
+        results = []
+        for tiles in (None, _tiled()):
+            advector = Advector(method, tiles=tiles)
+            advector.prepare(u, v, (1 / 60) / 6)
+            field = src.copy()
+            for _ in range(3):
+                advector.advect(field, field)
+            results.append(field)
+        assert np.array_equal(*results), f"{method}: tiled advection differs"
+
+
+def _segment_gaps(leaves):
+    ax, ay, bx, by = leaves.endpoints()
+    i, j = np.triu_indices(len(leaves), 1)
+    s, t = closest_points(
+        ax[i], ay[i], bx[i] - ax[i], by[i] - ay[i], ax[j], ay[j], bx[j] - ax[j], by[j] - ay[j]
+    )
+    gx = ax[j] + t * (bx[j] - ax[j]) - ax[i] - s * (bx[i] - ax[i])
+    gy = ay[j] + t * (by[j] - ay[j]) - ay[i] - s * (by[i] - ay[i])
+    return np.hypot(gx, gy)
+
+
+def test_leaf_segments_separate():
+    # Two crossed leaves, one lying on the first, and one far away
+    leaves = LeafArrays()
+    leaves.add([100, 102, 100, 160], [100, 100, 103, 100], [0.0, np.pi / 2, 0.1, 0.0], [20, 20, 24, 20])
+    leaves.vx[:] = [1.0, -1.0, 0.5, 0.0]
+    leaves.vy[:] = [0.0, 0.0, -2.0, 0.0]
+    momentum = (float(leaves.vx.sum()), float(leaves.vy.sum()))
+    grid = SpatialHash(300, 300, 24 + 5)
+    for _ in range(40):
+        grid.build(leaves.x, leaves.y)
+        resolve_segment_contacts(leaves, grid, 5.0, 0.0)
+    assert _segment_gaps(leaves).min() > 4.5, f"leaves still overlap: {_segment_gaps(leaves)}"
+    assert np.allclose((leaves.vx.sum(), leaves.vy.sum()), momentum, atol=1e-4), "momentum changed"
+    assert leaves.x[3] == 160 and leaves.spin[3] == 0, "untouched leaf moved"
+
+    # A leaf poking through the wall of a circle is pushed back inside
+    confine_to_circle(leaves, 100.0, 100.0, 50.0)
+    ax, ay, bx, by = leaves.endpoints()
+    reach = np.hypot(np.concatenate((ax, bx)) - 100.0, np.concatenate((ay, by)) - 100.0)
+    assert reach.max() <= 50.0 + 1e-3, f"leaf end {reach.max()} outside the circle"
+
+
+def test_pressure_solvers_agree():
+    # Lower half of a round cup filled with water moving down and sideways
+    rows, cols = np.mgrid[0:48, 0:48].astype(np.float32)
+    solid = (rows - 23.5) ** 2 + (cols - 23.5) ** 2 > 22 ** 2
+    fluid = ~solid & (rows > 20)
+    u = (20 * np.sin(cols / 7) * np.cos(rows / 9) * fluid).astype(np.float32)
+    v = ((40 + 15 * np.cos(cols / 5)) * fluid).astype(np.float32)
+    rhs = face_divergence(u, v, fluid, solid)
+
+    results = {}
+    for method, iterations in (("rbgs", 2000), ("multigrid", 100)):
+        solver = PressureSolver(method, iterations, tolerance=1e-4)
+        pressure = np.zeros_like(rhs)
+        solver.solve(rhs, fluid, solid, pressure)
+        assert solver.last_residual <= 1e-4, f"{method}: residual {solver.last_residual}"
+        assert not pressure[~fluid].any(), f"{method}: pressure outside the water"
+        results[method] = pressure
+    error = float(np.abs(results["rbgs"] - results["multigrid"]).max())
+    assert error < 1e-2 * float(np.abs(results["rbgs"]).max()), f"solvers differ by {error}"
+
+
+def test_gather_interpolates_grid():
+    # A linear field is reproduced exactly by the bilinear kernel away from
+    # the edges, and read cell by cell by the nearest kernel
+    rows, cols = np.mgrid[0:20, 0:30].astype(np.float32)
+    field = 3.0 * cols - 2.0 * rows
+    rng = np.random.default_rng(5)
+    x = rng.uniform(6, 24 * 6, 200)
+    y = rng.uniform(6, 14 * 6, 200)
+    (cic,) = gather(x, y, (field,), 1 / 6, "cic")
+    expected = 3.0 * (x / 6 - 0.5) - 2.0 * (y / 6 - 0.5)
+    assert np.abs(cic - expected).max() < 1e-3
+    (nearest,) = gather(x, y, (field,), 1 / 6, "nearest")
+    assert np.array_equal(nearest, field[(y // 6).astype(int), (x // 6).astype(int)])
+
+    # Masked-out cells are skipped rather than averaged in as zero
+    wet = np.ones_like(field)
+    wet[:, 15:] = 0.0
+    (masked,) = gather(np.array([14.9 * 6]), np.array([50.0]), (field,), 1 / 6, "cic", wet)
+    assert abs(masked[0] - field[8, 14]) < 1.5
+
+
+def _recorded_run(backend, steps):
+    sim = FluidSimulation(170, 128, kernel_backend=backend, seed=5, record=True, **REPLAY_OPTIONS)
+    for i in range(40):
+        sim.add_leaf(380 + i * 6, 520 + (i % 7) * 20)
+    for _ in range(steps):
+        sim.add_water(85, 30, 0.1)
+        sim.step(SIM_DT)
+    return sim
+
+
+def test_replay_reproduces_run():
+    recorded = _recorded_run("numpy", steps=30)
+    script = InputScript.from_dict(recorded.script.to_dict())
+    again = FluidSimulation(170, 128, kernel_backend="numpy", seed=script.seed, **REPLAY_OPTIONS)
+    replay(script, again)
+    assert all(diff == 0.0 for diff in compare(recorded, again).values())
+
+
+def test_replay_matches_reference_backend():
+    # Contacts amplify float rounding within a few steps, so backends are
+    # compared over a short run, and only on particles and leaves
+    reference = _recorded_run("python", steps=4)
+    for backend in available_backends():
+        sim = FluidSimulation(170, 128, kernel_backend=backend, seed=reference.seed, **REPLAY_OPTIONS)
+        replay(reference.script, sim)
+        diffs = compare(reference, sim)
+        for name in ("particles", "leaves"):
+            assert diffs[name] < 1e-2, f"{backend}: {name} differ by {diffs[name]} after replay"
+
+
+def main():
+    print("Backends:", ", ".join(available_backends()))
+    test_particle_contacts_match_reference()
+    test_packed_leaves_settle_in_cup()
+    test_spatial_hash_radius_query()
+    test_advection_matches_reference()
+    test_maccormack_keeps_detail()
+    test_tiled_advection_matches_serial()
+    test_leaf_segments_separate()
+    test_pressure_solvers_agree()
+    test_gather_interpolates_grid()
+    test_replay_reproduces_run()
+    test_replay_matches_reference_backend()
+    print("All kernel backends match the reference")
+
+
+if __name__ == "__main__":
+    main()
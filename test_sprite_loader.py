@@ -0,0 +1,88 @@
+"""Checks for sprite trimming, cache counters and the memory budget
+
+Run with: uv run test_sprite_loader.py (or pytest test_sprite_loader.py)
+Sprites are built in memory, so no sprite sheets or display are needed.
+"""
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from game.sprite_loader import MEMORY_BUDGET_HEADROOM, SpriteLoader
+
+
+def _padded_sprite(size, content):
+    """A transparent cell of `size` with an opaque `content` rect inside"""
+    surface = pygame.Surface(size, pygame.SRCALPHA)
+    surface.fill((0, 0, 0, 0))
+    surface.fill((200, 120, 60, 255), pygame.Rect(content))
+    return surface
+
+
+def test_trimmed_rect_matches_untrimmed_placement():
+    loader = SpriteLoader(use_atlas=False)
+    loader._store_variants("petals", {"a": _padded_sprite((15, 15), (4, 3, 6, 9))})
+    trim = loader.trims[("petals", "a")]
+    for center in ((100.7, 50.6), (100.2, 50.4), (100.5, 50.5), (33, 21)):
+        untrimmed = pygame.Surface(trim.source_size).get_rect(center=center)
+        expected = untrimmed.move(trim.offset).topleft
+        rect = loader.get_sprite_rect("petals", "a", center)
+        assert rect.topleft == expected, f"{center}: {rect.topleft} != {expected}"
+
+
+def test_one_draw_counts_one_hit():
+    loader = SpriteLoader(use_atlas=False)
+    loader._store_variants("mimi", {"normal": _padded_sprite((40, 40), (5, 8, 20, 25))})
+    for flip_x in (False, True):
+        sprite = loader.get_sprite("mimi", "normal", flip_x=flip_x)
+        loader.get_sprite_rect("mimi", "normal", (50, 50), flip_x=flip_x)
+        loader.get_sprite_rect("mimi", "normal", (50, 50), surface=sprite, flip_x=flip_x)
+    stats = loader.get_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (2, 0), f"two draws counted as {stats}"
+
+
+def test_undrawn_large_sprite_is_evicted():
+    loader = SpriteLoader(use_atlas=True)
+    loader.set_config([
+        {"name": "logo", "variants": ["single"], "render_size": [500, 233]},
+        {"name": "border_frame", "variants": ["single"], "render_size": [1024, 768]},
+        {"name": "petals", "variants": ["a", "b"], "render_size": [15, 15]},
+    ])
+    loader.manifest = {"title": ["logo", "petals"], "game": ["border_frame", "petals"]}
+    loader.budget_headroom = MEMORY_BUDGET_HEADROOM
+    loader.memory_budget = loader.manifest_memory_budget()
+    # Petals pack into the atlas, so only the game's border frame sizes the budget
+    assert loader.memory_budget == int(1024 * 768 * 4 * MEMORY_BUDGET_HEADROOM), loader.memory_budget
+
+    def draw(name, size):
+        loader.begin_frame()
+        if name not in loader.sprites:
+            variants = loader.config[name]["variants"]
+            loader._store_variants(name, {variant: _padded_sprite(size, (0, 0, *size)) for variant in variants})
+            loader.pack_atlas(keep=name)
+        for variant in loader.config[name]["variants"]:
+            loader.get_sprite(name, variant)
+
+    draw("logo", (500, 233))
+    draw("petals", (15, 15))
+    assert "logo" in loader.sprites
+    # Leaving the title scene: the logo was not drawn in the frame that
+    # loads the border frame, so it makes room for it
+    draw("border_frame", (1024, 768))
+    assert "logo" not in loader.sprites, "undrawn logo was kept over budget"
+    assert "border_frame" in loader.sprites and "petals" in loader.sprites
+    stats = loader.get_cache_stats()
+    assert stats["evictions"] == 1 and stats["bytes"] <= stats["budget"], stats
+
+
+def main():
+    pygame.init()
+    test_trimmed_rect_matches_untrimmed_placement()
+    test_one_draw_counts_one_hit()
+    test_undrawn_large_sprite_is_evicted()
+    print("Sprite loader checks passed")
+
+
+if __name__ == "__main__":
+    main()